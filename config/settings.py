@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import parse_database_url, sqlite_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero: mide la petición completa (no hace nada si REQUEST_METRICS es False)
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
      'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -78,13 +83,33 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite con WAL, busy_timeout y BEGIN IMMEDIATE (ver sqlite_config en config/database.py).
+# db.sqlite3 es local y no se versiona: WAL reescribe el archivo en cada conexión.
+# Se crea con: python manage.py migrate
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_config(BASE_DIR / 'db.sqlite3', test_name=BASE_DIR / 'test_db.sqlite3'),
 }
 
+# ----------------------------------------------------------------------------------
+# ✅ POSTGRESQL DESDE DATABASE_URL (Render la define en render.yaml)
+# - Sin DATABASE_URL se usa el SQLite de arriba (desarrollo local)
+# - CONN_MAX_AGE (segundos, por defecto 600): cada worker reutiliza su conexión en
+#   lugar de pagar conexión TCP + autenticación en cada petición; antes de
+#   reutilizarla se verifica que siga viva (CONN_HEALTH_CHECKS)
+# - DATABASE_POOL_MAX_SIZE > 0: pool de conexiones de Django en lugar de conexiones
+#   persistentes (requiere psycopg 3: pip install "psycopg[binary,pool]")
+# - Pruebas contra un PostgreSQL local:
+#   DATABASE_URL=postgres://postgres@localhost/casos python manage.py test
+# ----------------------------------------------------------------------------------
+DATABASE_URL = os.environ.get('DATABASE_URL', '')
+
+if DATABASE_URL:
+    DATABASES['default'] = parse_database_url(
+        DATABASE_URL,
+        conn_max_age=int(os.environ.get('CONN_MAX_AGE', 600)),
+        pool_max_size=int(os.environ.get('DATABASE_POOL_MAX_SIZE', 0)),
+    )
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,4 +162,69 @@ STATICFILES_DIRS = [
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # ✅ Para whitenoise
 
 # Sirve archivos estáticos comprimidos
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
\ No newline at end of file
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# Paginación de los listados de casos (admin_panel y judge_panel)
+CASES_PAGE_SIZE = 50
+CASES_MAX_PAGE_SIZE = 200
+
+
+# Archivo cuya fecha de modificación publica la versión de PlatformSettings.
+# Todos los workers lo consultan (os.stat) para saber si su copia en memoria sigue vigente.
+PLATFORM_SETTINGS_VERSION_FILE = BASE_DIR / '.platform_settings_version'
+
+# Reportes CSV generados en segundo plano (ver core/reports.py). Con REPORTS_IN_PROCESS
+# los genera un hilo del proceso web y quedan en su disco local: un solo servidor.
+# Con REPORTS_IN_PROCESS=0 los genera el comando run_report_jobs, que debe ver el
+# mismo REPORTS_ROOT que la web
+REPORTS_ROOT = BASE_DIR / 'reports'
+REPORTS_IN_PROCESS = os.environ.get('REPORTS_IN_PROCESS', '1') == '1'
+
+# Versión de los datos de casos (ver PLATFORM_SETTINGS_VERSION_FILE): cambia con cada
+# caso creado, editado o eliminado e invalida las secciones del dashboard en caché
+CASE_DATA_VERSION_FILE = BASE_DIR / '.case_data_version'
+
+# Caché de secciones del dashboard (tarjetas y datos de gráficos).
+# LocMemCache guarda una copia por worker; para compartirla entre workers:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / '.cache' / 'dashboard',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dashboard': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'dashboard',
+        'TIMEOUT': 60 * 60,
+    },
+}
+DASHBOARD_CACHE = 'dashboard'
+
+
+# ----------------------------------------------------------------------------------
+# ✅ MÉTRICAS POR PETICIÓN (core.middleware.RequestMetricsMiddleware)
+# - Desactivadas por defecto; activar con la variable de entorno REQUEST_METRICS=1
+# - Encabezado Server-Timing + una línea JSON por petición en el logger 'core.requests'
+# - Umbrales para el aviso: tiempo total, número de consultas y repeticiones de
+#   una misma consulta (N+1)
+# ----------------------------------------------------------------------------------
+REQUEST_METRICS = os.environ.get('REQUEST_METRICS', '') == '1'
+REQUEST_METRICS_SLOW_MS = int(os.environ.get('REQUEST_METRICS_SLOW_MS', 500))
+REQUEST_METRICS_MAX_QUERIES = int(os.environ.get('REQUEST_METRICS_MAX_QUERIES', 50))
+REQUEST_METRICS_REPEATED_QUERIES = int(os.environ.get('REQUEST_METRICS_REPEATED_QUERIES', 5))
+
+# Registros a la consola (Render los muestra en la pestaña Logs)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '{asctime} {levelname} {name} {message}', 'style': '{'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simple'},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'core.requests': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.shortcuts import redirect
 from django.utils.html import format_html
-from .models import AuditLog, UserProfile, Case, PlatformSettings
+from .models import AuditLog, UserProfile, Case, CaseLocationBlock, CaseResolutionMethod, PlatformSettings, ReportJob
 
 
 # ----------------------------------------------------------------------------------
@@ -49,6 +49,16 @@ class UserProfileAdmin(admin.ModelAdmin):
         return self.readonly_fields
 
 
+class CaseLocationBlockInline(admin.TabularInline):
+    model = CaseLocationBlock
+    extra = 0
+
+
+class CaseResolutionMethodInline(admin.TabularInline):
+    model = CaseResolutionMethod
+    extra = 0
+
+
 # ----------------------------------------------------------------------------------
 # ✅ ADMINISTRACIÓN DE CASOS (Case)
 # - Gestión completa de casos comunitarios
@@ -63,13 +73,16 @@ class CaseAdmin(admin.ModelAdmin):
         'status',
         'judge',
         'date_registered',
+        'due_date',
         'extension_granted'
     )
     list_filter = ('status', 'conflict_type', 'date_registered', 'judge', 'extension_granted')
+    list_select_related = ('judge',)
     search_fields = ('case_number', 'applicant_name', 'involved_name', 'applicant_id', 'involved_id')
-    readonly_fields = ('case_number', 'date_registered')
+    readonly_fields = ('case_number', 'date_registered', 'due_date')
     date_hierarchy = 'date_registered'
     ordering = ('-date_registered',)
+    inlines = [CaseLocationBlockInline, CaseResolutionMethodInline]
 
     fieldsets = (
         ('Número y Fecha', {
@@ -82,13 +95,13 @@ class CaseAdmin(admin.ModelAdmin):
             'fields': ('involved_name', 'involved_id')
         }),
         ('Detalles del Conflicto', {
-            'fields': ('conflict_description', 'location', 'conflict_type', 'other_conflict_type', 'estimated_value')
+            'fields': ('conflict_description', 'location', 'other_location_block', 'conflict_type', 'other_conflict_type', 'estimated_value')
         }),
         ('Resolución', {
-            'fields': ('resolution_method', 'other_resolution_method', 'notes')
+            'fields': ('other_resolution_method', 'notes')
         }),
         ('Gestión', {
-            'fields': ('status', 'judge', 'extension_granted')
+            'fields': ('status', 'judge', 'extension_granted', 'due_date')
         }),
     )
 
@@ -163,6 +176,7 @@ class PlatformSettingsAdmin(admin.ModelAdmin):
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ('action', 'case_number', 'performed_by', 'timestamp')
     list_filter = ('action', 'timestamp', 'performed_by')
+    list_select_related = ('performed_by',)
     search_fields = ('case_number', 'performed_by__username', 'details')
     readonly_fields = ('action', 'case_number', 'performed_by', 'timestamp', 'details')
     ordering = ['-timestamp']
@@ -171,3 +185,17 @@ class AuditLogAdmin(admin.ModelAdmin):
         return False  # No se pueden crear manualmente
     
     
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'requested_by', 'row_count', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    list_select_related = ('requested_by',)
+    readonly_fields = (
+        'requested_by', 'filters', 'filters_hash', 'data_version', 'status', 'file_name',
+        'row_count', 'error', 'created_at', 'started_at', 'finished_at',
+    )
+
+    def has_add_permission(self, request):
+        return False  # Se piden desde el panel de administración
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Conecta las señales que mantienen al día el índice de búsqueda
+        # y el resumen diario de casos
+        from . import rollups, search  # noqa: F401
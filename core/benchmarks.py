@@ -0,0 +1,215 @@
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Case, UserProfile
+
+
+# ----------------------------------------------------------------------------------
+# ✅ BENCHMARK DE VISTAS (comando benchmark_views)
+# - Cada vista de core.urls pasa por el cliente de pruebas de Django sobre datos de
+#   seed_cases (1k, 100k, 1M casos), con caché y base de datos reales
+# - Por vista: p50/p95 de latencia, primera petición (caché fría), consultas SQL y
+#   pico de memoria (tracemalloc, en una petición aparte para no alterar los tiempos)
+# - Presupuestos: consultas máximas por vista (no dependen del tamaño: un aumento
+#   suele ser un N+1) y p95 máximo por tamaño de datos
+# - Contra un resultado anterior (--baseline) también falla si una vista hace más
+#   consultas o su mediana empeora más allá de la tolerancia
+# ----------------------------------------------------------------------------------
+DATASET_SIZES = (1_000, 100_000, 1_000_000)
+
+# {vista: {'queries': máximo, 'p95_ms': {casos: máximo}}}; cualquiera de los dos
+# puede ser un número o un diccionario por tamaño (el tamaño más cercano por debajo
+# aplica a tamaños intermedios). Solo la exportación por tandas hace más consultas
+# con más datos; las lecturas de página y las escrituras de un caso no deben crecer
+BUDGETS = {
+    'admin_panel': {'queries': 8, 'p95_ms': {1_000: 150, 100_000: 300, 1_000_000: 800}},
+    'admin_panel?status': {'queries': 8, 'p95_ms': {1_000: 150, 100_000: 300, 1_000_000: 800}},
+    'admin_panel?judge': {'queries': 8, 'p95_ms': {1_000: 150, 100_000: 300, 1_000_000: 800}},
+    'admin_panel?dates': {'queries': 8, 'p95_ms': {1_000: 150, 100_000: 300, 1_000_000: 800}},
+    'admin_panel?q': {'queries': 8, 'p95_ms': {1_000: 150, 100_000: 400, 1_000_000: 1500}},
+    'admin_panel?deadline': {'queries': 8, 'p95_ms': {1_000: 150, 100_000: 400, 1_000_000: 1500}},
+    'chart_data': {'queries': 4, 'p95_ms': {1_000: 100, 100_000: 200, 1_000_000: 500}},
+    'judge_panel': {'queries': 5, 'p95_ms': {1_000: 100, 100_000: 200, 1_000_000: 500}},
+    'case_detail': {'queries': 9, 'p95_ms': {1_000: 80, 100_000: 80, 1_000_000: 100}},
+    'case_detail (304)': {'queries': 4, 'p95_ms': {1_000: 30, 100_000: 30, 1_000_000: 40}},
+    'admin_case_detail': {'queries': 8, 'p95_ms': {1_000: 80, 100_000: 80, 1_000_000: 100}},
+    'register_case (POST)': {'queries': 26, 'p95_ms': {1_000: 150, 100_000: 150, 1_000_000: 200}},
+    'edit_case': {'queries': 7, 'p95_ms': {1_000: 100, 100_000: 100, 1_000_000: 120}},
+    'edit_case (POST)': {'queries': 18, 'p95_ms': {1_000: 150, 100_000: 150, 1_000_000: 200}},
+    'download_cases_csv (30 días)': {'queries': {1_000: 6, 100_000: 12, 1_000_000: 80}, 'p95_ms': {1_000: 300, 100_000: 2000, 1_000_000: 8000}},
+}
+
+# Contra la línea base se compara la mediana (el p95 de pocas peticiones es casi el
+# máximo y varía mucho); se tolera este margen y esta diferencia mínima por ruido
+REGRESSION_TOLERANCE = 0.5
+REGRESSION_MIN_MS = 10
+
+
+def benchmark_users():
+    """(admin, juez con casos) para las peticiones; el admin se crea si no existe"""
+    admin = User.objects.filter(profile__role='admin').first()
+    if admin is None:
+        admin = User.objects.create_user(username='bench_admin', password='x')
+        UserProfile.objects.create(
+            user=admin, full_name='Admin', last_name='Benchmark', id_number='0000000001',
+            date_of_birth=timezone.localdate() - timedelta(days=365 * 40),
+            role_request='admin', role='admin', approved_by_admin=True,
+        )
+    judge = Case.objects.exclude(judge=None).select_related('judge').order_by('id').first().judge
+    return admin, judge
+
+
+def case_form_data(case, **overrides):
+    data = {
+        'applicant_name': case.applicant_name,
+        'applicant_id': case.applicant_id,
+        'involved_name': case.involved_name,
+        'conflict_description': case.conflict_description,
+        'location': case.location,
+        'conflict_type': 'vecinal',
+        'location_blocks': ['bloque_15'],
+        'resolution_method': ['conciliacion'],
+        'consentimiento_1': 'on',
+        'consentimiento_2': 'on',
+    }
+    data.update(overrides)
+    return data
+
+
+def benchmark_requests(admin, judge):
+    """[(nombre, usuario, método, url, datos, encabezados)] de las vistas medidas"""
+    today = timezone.localdate()
+    case = Case.objects.filter(judge=judge).order_by('-date_registered', '-id').first()
+    surname = case.applicant_name.split()[-1]
+    last_month = {'date_from': (today - timedelta(days=30)).isoformat(), 'date_to': today.isoformat()}
+    admin_panel = reverse('core:admin_panel')
+    detail = reverse('core:case_detail', args=[case.pk])
+    edit = reverse('core:edit_case', args=[case.pk])
+    return [
+        ('admin_panel', admin, 'get', admin_panel, {}, {}),
+        ('admin_panel?status', admin, 'get', admin_panel, {'status': 'resuelto'}, {}),
+        ('admin_panel?judge', admin, 'get', admin_panel, {'judge': judge.username}, {}),
+        ('admin_panel?dates', admin, 'get', admin_panel, last_month, {}),
+        ('admin_panel?q', admin, 'get', admin_panel, {'q': surname}, {}),
+        ('admin_panel?deadline', admin, 'get', admin_panel, {'deadline': 'vencido'}, {}),
+        ('chart_data', admin, 'get', reverse('core:chart_data'), {}, {}),
+        ('judge_panel', judge, 'get', reverse('core:judge_panel'), {}, {}),
+        ('case_detail', judge, 'get', detail, {}, {}),
+        ('case_detail (304)', judge, 'get', detail, {}, {'etag_from': detail}),
+        ('admin_case_detail', admin, 'get', reverse('core:admin_case_detail', args=[case.pk]), {}, {}),
+        ('register_case (POST)', judge, 'post', reverse('core:register_case'), case_form_data(case), {}),
+        ('edit_case', admin, 'get', edit, {}, {}),
+        ('edit_case (POST)', admin, 'post', edit, case_form_data(case, notes='benchmark'), {}),
+        ('download_cases_csv (30 días)', admin, 'get', reverse('core:download_cases_csv'), last_month, {}),
+    ]
+
+
+def perform(client, method, url, data, headers):
+    response = getattr(client, method)(url, data, **headers)
+    if response.streaming:
+        # El tiempo de una descarga incluye generar todo el archivo
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def measure_view(client, method, url, data, headers, repeat):
+    """Latencias (ms), consultas de la última petición y pico de memoria (KiB)"""
+    if 'etag_from' in headers:
+        # Dos visitas: la primera crea la cookie CSRF, que forma parte del ETag
+        perform(client, 'get', headers['etag_from'], {}, {})
+        etag = perform(client, 'get', headers['etag_from'], {}, {})['ETag']
+        headers = {'HTTP_IF_NONE_MATCH': etag}
+    latencies = []
+    # La primera petición (caché fría) se informa aparte, no entra en p50/p95
+    for _ in range(repeat + 1):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = perform(client, method, url, data, headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+    # Se cuenta ya: la próxima petición vacía el registro de consultas (reset_queries)
+    query_count = len(queries)
+
+    tracemalloc.start()
+    try:
+        perform(client, method, url, data, headers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ordered = sorted(latencies[1:])
+    return {
+        'status': response.status_code,
+        'first_ms': round(latencies[0], 2),
+        'p50_ms': round(statistics.median(ordered), 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        'queries': query_count,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_view_benchmarks(repeat, only=None):
+    """{vista: métricas} sobre los datos actuales de la base de datos"""
+    admin, judge = benchmark_users()
+    clients = {}
+    results = {}
+    for name, user, method, url, data, headers in benchmark_requests(admin, judge):
+        if only and name not in only:
+            continue
+        if user.pk not in clients:
+            clients[user.pk] = Client()
+            clients[user.pk].force_login(user)
+        results[name] = measure_view(clients[user.pk], method, url, data, headers, repeat)
+    return results
+
+
+def limit_for(limit, cases):
+    """Máximo para el tamaño de datos: un número, o {casos: máximo} (claves de JSON incluidas)"""
+    if not isinstance(limit, dict):
+        return limit
+    limits = {int(size): value for size, value in limit.items()}
+    sizes = [size for size in sorted(limits) if size <= cases] or sorted(limits)[:1]
+    return limits[sizes[-1]] if sizes else None
+
+
+def budget_for(budgets, name, cases):
+    """(consultas, p95) máximos de la vista para el tamaño de datos (None = sin límite)"""
+    budget = budgets.get(name) or {}
+    return limit_for(budget.get('queries'), cases), limit_for(budget.get('p95_ms'), cases)
+
+
+def check_results(results, budgets, baseline=None, tolerance=REGRESSION_TOLERANCE):
+    """Lista de incumplimientos (vacía si todo está dentro de presupuesto)"""
+    problems = []
+    for cases, views in results.items():
+        previous = (baseline or {}).get(str(cases), {})
+        for name, metrics in views.items():
+            max_queries, max_p95 = budget_for(budgets, name, int(cases))
+            if metrics['status'] >= 400:
+                problems.append(f"{cases} casos, {name}: respuesta {metrics['status']}")
+            if max_queries is not None and metrics['queries'] > max_queries:
+                problems.append(f"{cases} casos, {name}: {metrics['queries']} consultas (máximo {max_queries})")
+            if max_p95 is not None and metrics['p95_ms'] > max_p95:
+                problems.append(f"{cases} casos, {name}: p95 {metrics['p95_ms']} ms (máximo {max_p95} ms)")
+            before = previous.get(name)
+            if not before:
+                continue
+            if metrics['queries'] > before['queries']:
+                problems.append(
+                    f"{cases} casos, {name}: {metrics['queries']} consultas (antes {before['queries']})"
+                )
+            slower = metrics['p50_ms'] - before['p50_ms']
+            if slower > REGRESSION_MIN_MS and metrics['p50_ms'] > before['p50_ms'] * (1 + tolerance):
+                problems.append(
+                    f"{cases} casos, {name}: p50 {metrics['p50_ms']} ms (antes {before['p50_ms']} ms)"
+                )
+    return problems
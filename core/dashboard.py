@@ -0,0 +1,73 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .metrics import record_cache
+from .models import get_case_data_version
+from .reports import normalize_filters
+
+
+# ----------------------------------------------------------------------------------
+# ✅ CACHÉ DE SECCIONES DEL DASHBOARD (tarjetas de resumen y datos de gráficos)
+# - Clave: sección + filtros normalizados + versión de los datos de casos + día
+#   (+ hora si la sección cuenta vencidos/por vencer o con el filtro de plazo:
+#   esos conteos cambian solo con el paso del tiempo)
+# - La versión se publica al confirmar cualquier cambio de casos (core/rollups.py):
+#   las entradas viejas dejan de usarse solas y expiran con el TIMEOUT de la caché
+# - Backend configurable en CACHES[DASHBOARD_CACHE] (LocMemCache o FileBasedCache)
+# - Dentro de una transacción no se usa la caché: se podrían guardar (o mostrar
+#   en lugar de los propios cambios) datos aún no confirmados
+# - Sin versión (el archivo de versión no se puede leer ni escribir) tampoco: no
+#   habría forma de saber cuándo cambian los casos
+# - Aciertos y fallos por petición: RequestMetricsMiddleware (core/middleware.py)
+# ----------------------------------------------------------------------------------
+def dashboard_cache():
+    return caches[getattr(settings, 'DASHBOARD_CACHE', 'default')]
+
+
+def dashboard_version(filters, hourly=False, now=None):
+    """
+    Versión de los datos que muestra el dashboard con estos filtros, o None si no
+    hay versión de los datos de casos. hourly: la sección incluye conteos de
+    plazo (vencidos / por vencer).
+    """
+    data_version = get_case_data_version()
+    if data_version is None:
+        return None
+    now = timezone.localtime(now)
+    version = f"{data_version}:{now:%Y%m%d}"
+    if hourly or 'deadline' in filters:
+        version = f"{version}{now:%H}"
+    return version
+
+
+def fragment_key(name, params, hourly=False):
+    """Clave de caché de la sección `name` para los filtros recibidos (None sin versión)"""
+    filters = normalize_filters(params)
+    version = dashboard_version(filters, hourly)
+    if version is None:
+        return None
+    payload = json.dumps({'filters': filters, 'version': version}, sort_keys=True)
+    return f"dashboard:{name}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def cached_fragment(name, params, build, hourly=False):
+    """Devuelve la sección desde la caché o la construye con build() y la guarda"""
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return build()
+    key = fragment_key(name, params, hourly)
+    if key is None:
+        return build()
+    cache = dashboard_cache()
+    value = cache.get(key)
+    record_cache(value is not None)
+    if value is not None:
+        return value
+    value = build()
+    cache.set(key, value)
+    return value
+
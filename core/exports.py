@@ -0,0 +1,91 @@
+import csv
+from itertools import islice
+
+from .models import Case, CaseLocationBlock
+
+
+# ----------------------------------------------------------------------------------
+# ✅ EXPORTACIÓN DE CASOS A CSV
+# - Lee solo las columnas exportadas (values_list), nunca instancias completas
+# - Recorre la tabla con un cursor del servidor en bloques de CHUNK_SIZE filas
+# - Genera el CSV línea por línea: la memoria no depende del número de casos
+# ----------------------------------------------------------------------------------
+CHUNK_SIZE = 2000
+
+CSV_HEADER = [
+    'Número de Caso', 'Fecha de Registro', 'Solicitante', 'Cédula Solicitante',
+    'Involucrado', 'Cédula Involucrado', 'Lugar', 'Tipo de Conflicto',
+    'Bloque(s)', 'Otro bloque', 'Valor Estimado', 'Estado', 'Juez Asignado',
+    'Prórroga', 'Observaciones'
+]
+
+CSV_COLUMNS = (
+    'id', 'case_number', 'date_registered', 'applicant_name', 'applicant_id',
+    'involved_name', 'involved_id', 'location', 'conflict_type',
+    'other_location_block', 'estimated_value', 'status', 'judge__username',
+    'extension_granted', 'notes',
+)
+
+
+class Echo:
+    """Pseudo-buffer para csv.writer: devuelve la línea en lugar de guardarla"""
+
+    def write(self, value):
+        return value
+
+
+def iter_case_rows(cases, chunk_size=CHUNK_SIZE):
+    """
+    Genera las filas del reporte (sin encabezado) para el queryset recibido.
+    Los bloques de cada tanda de casos se cargan con una sola consulta.
+    """
+    conflict_types = dict(Case.CONFLICT_TYPE_CHOICES)
+    statuses = dict(Case.CASE_STATUS)
+    rows = (
+        cases.order_by('-date_registered', '-id')
+        .values_list(*CSV_COLUMNS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        blocks = {}
+        block_rows = (
+            CaseLocationBlock.objects.filter(case_id__in=[row[0] for row in chunk])
+            .order_by('id')
+            .values_list('case_id', 'block')
+        )
+        for case_id, block in block_rows:
+            blocks.setdefault(case_id, []).append(block)
+
+        for (case_id, case_number, date_registered, applicant_name, applicant_id,
+             involved_name, involved_id, location, conflict_type, other_location_block,
+             estimated_value, status, judge_username, extension_granted, notes) in chunk:
+            yield [
+                case_number,
+                date_registered.strftime('%d/%m/%Y %H:%M'),
+                applicant_name,
+                applicant_id,
+                involved_name,
+                involved_id,
+                location,
+                conflict_types.get(conflict_type, conflict_type),
+                ', '.join(blocks.get(case_id, [])),
+                other_location_block or '',
+                estimated_value or '',
+                statuses.get(status, status),
+                judge_username or '',
+                'Sí' if extension_granted else 'No',
+                notes or ''
+            ]
+
+
+def iter_cases_csv(cases, chunk_size=CHUNK_SIZE):
+    """Genera el CSV completo (encabezado incluido) como una secuencia de líneas"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in iter_case_rows(cases, chunk_size=chunk_size):
+        yield writer.writerow(row)
@@ -240,17 +240,11 @@ class CaseForm(forms.ModelForm):
             if 'status' in self.fields:
                 del self.fields['status']
         
-        # Inicializar checkboxes de resolución
-        if self.instance.pk and self.instance.resolution_method:
-            self.fields['resolution_method'].initial = [
-                method.strip() for method in self.instance.resolution_method.split(',') if method.strip()
-            ]
-        # ✅ Inicializar checkboxes de bloques   
-        if self.instance.pk and self.instance.location_blocks:
-            self.fields['location_blocks'].initial = [
-                block.strip() for block in self.instance.location_blocks.split(',') if block.strip()
-            ]    
-            
+        # Inicializar checkboxes de resolución y de bloques
+        if self.instance.pk:
+            self.fields['resolution_method'].initial = self.instance.get_resolution_method_list()
+            self.fields['location_blocks'].initial = self.instance.get_location_blocks_list()
+
         # ✅ Ocultar consentimientos si es edición (caso ya existe)
         if self.instance.pk:
             self.fields['consentimiento_1'].widget = forms.HiddenInput()
@@ -279,4 +273,13 @@ class CaseForm(forms.ModelForm):
         if location_blocks and 'otro' in location_blocks and not other_location_block:
             self.add_error('other_location_block', 'Debe especificar el otro bloque.')
 
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+
+    def _save_m2m(self):
+        """
+        Guarda los bloques y medios de resolución seleccionados en sus tablas.
+        Se ejecuta con form.save() o con form.save_m2m() si se usó commit=False.
+        """
+        super()._save_m2m()
+        self.instance.set_location_blocks(self.cleaned_data.get('location_blocks') or [])
+        self.instance.set_resolution_methods(self.cleaned_data.get('resolution_method') or [])
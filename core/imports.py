@@ -0,0 +1,218 @@
+import csv
+import json
+import re
+import time
+from datetime import datetime
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .forms import CaseForm
+from .models import AuditLog, Case, CaseLocationBlock, CaseNumberSequence, CaseResolutionMethod
+from .rollups import mark_days_changed, registered_day
+from .search import index_cases
+
+
+# ----------------------------------------------------------------------------------
+# ✅ IMPORTACIÓN MASIVA DE CASOS (comando import_cases)
+# - Lee CSV o NDJSON (un objeto JSON por línea) fila por fila, sin cargar el archivo
+# - Cada fila se valida con las reglas de CaseForm; las filas inválidas se reportan
+#   y se omiten
+# - Por tanda de CHUNK_SIZE casos, en una transacción: números de caso reservados
+#   en bloque, bulk_create de casos, bloques, medios de resolución y auditoría
+# - La memoria depende del tamaño de la tanda, no del tamaño del archivo
+# ----------------------------------------------------------------------------------
+CHUNK_SIZE = 1000
+
+TRUE_VALUES = {'1', 'si', 'sí', 'true', 'yes', 'x'}
+
+# Errores de fila que se guardan para mostrar (el resto solo se cuenta)
+MAX_ERRORS = 20
+
+
+class ImportStats:
+    """
+    Contadores de la importación (se actualizan tanda por tanda). Se cuentan
+    todas las filas con errores, pero solo se guardan las primeras max_errors.
+    """
+
+    def __init__(self, max_errors=MAX_ERRORS):
+        self.read = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+
+    def add_error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, message))
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+
+def iter_records(stream, file_format):
+    """Genera (número de línea, diccionario) desde un archivo CSV o NDJSON abierto"""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield line_number, error
+            continue
+        yield line_number, record
+
+
+def split_values(value):
+    """Lista de códigos desde 'a;b', 'a, b' o una lista JSON"""
+    if value in (None, ''):
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in re.split(r'[;,|]', str(value)) if item.strip()]
+
+
+def parse_registered(value):
+    """Fecha de registro histórica (ISO 8601, fecha o fecha y hora); None si no viene"""
+    if value in (None, ''):
+        return None
+    moment = parse_datetime(str(value))
+    if moment is None:
+        day = parse_date(str(value))
+        if day is None:
+            raise ValueError(f"Fecha de registro no válida: {value}")
+        moment = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def find_judge(username):
+    """Juez aprobado con ese usuario, o None (los admin y pendientes no reciben casos)"""
+    return User.objects.filter(username=username, profile__role='juez').first()
+
+
+class CaseImporter:
+    """Convierte registros en casos válidos y los guarda por tandas"""
+
+    def __init__(self, default_judge=None, chunk_size=CHUNK_SIZE, performed_by=None):
+        self.default_judge = default_judge
+        self.chunk_size = chunk_size
+        self.performed_by = performed_by
+        self.judges = {}
+
+    def get_judge(self, username):
+        if not username:
+            return self.default_judge
+        if username not in self.judges:
+            self.judges[username] = find_judge(username)
+        judge = self.judges[username]
+        if judge is None:
+            raise ValueError(f"Juez no encontrado: {username}")
+        return judge
+
+    def build(self, record):
+        """Devuelve (caso sin guardar, bloques, medios) o lanza ValueError con los errores"""
+        if not isinstance(record, dict):
+            raise ValueError(f"Registro no válido: {record}")
+        data = {key: value for key, value in record.items() if value is not None}
+        data['location_blocks'] = split_values(record.get('location_blocks'))
+        data['resolution_method'] = split_values(record.get('resolution_method'))
+        data['consentimiento_1'] = data['consentimiento_2'] = True
+
+        form = CaseForm(data)
+        if not form.is_valid():
+            errors = '; '.join(
+                f"{field}: {' '.join(messages)}" for field, messages in form.errors.items()
+            )
+            raise ValueError(errors)
+
+        case = form.save(commit=False)
+        case.judge = self.get_judge(str(record.get('judge') or '').strip())
+        status = str(record.get('status') or 'registrado').strip()
+        if status not in dict(Case.CASE_STATUS):
+            raise ValueError(f"Estado no válido: {status}")
+        case.status = status
+        case.extension_granted = str(record.get('extension_granted') or '').strip().lower() in TRUE_VALUES
+        case.date_registered = parse_registered(record.get('date_registered')) or case.date_registered
+        case.due_date = case.calculate_due_date()
+        return case, form.cleaned_data['location_blocks'], form.cleaned_data['resolution_method']
+
+    def run(self, records, stats=None, on_chunk=None):
+        """
+        Importa los registros (pares (línea, registro)) y devuelve las estadísticas.
+        on_chunk(stats) se llama después de cada tanda guardada.
+        """
+        stats = stats or ImportStats()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return stats
+            valid = []
+            for line_number, record in chunk:
+                stats.read += 1
+                try:
+                    if isinstance(record, Exception):
+                        raise ValueError(str(record))
+                    valid.append(self.build(record))
+                except ValueError as error:
+                    stats.add_error(line_number, str(error))
+            if valid:
+                self.save_chunk(valid)
+                stats.imported += len(valid)
+            if on_chunk:
+                on_chunk(stats)
+
+    def save_chunk(self, items):
+        """Guarda una tanda completa en una sola transacción"""
+        with transaction.atomic():
+            # ✅ Números de caso: un bloque por mes de registro
+            by_month = {}
+            for case, _, _ in items:
+                by_month.setdefault((case.date_registered.year, case.date_registered.month), []).append(case)
+            for (year, month), cases in by_month.items():
+                first = CaseNumberSequence.allocate(year, month, count=len(cases))
+                for offset, case in enumerate(cases):
+                    case.case_number = CaseNumberSequence.format_case_number(year, month, first + offset)
+
+            cases = Case.objects.bulk_create([case for case, _, _ in items])
+            CaseLocationBlock.objects.bulk_create([
+                CaseLocationBlock(case=case, block=block)
+                for case, (_, blocks, _) in zip(cases, items)
+                for block in dict.fromkeys(blocks)
+            ])
+            CaseResolutionMethod.objects.bulk_create([
+                CaseResolutionMethod(case=case, method=method)
+                for case, (_, _, methods) in zip(cases, items)
+                for method in dict.fromkeys(methods)
+            ])
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    action='CREATED',
+                    case_number=case.case_number,
+                    performed_by=self.performed_by or case.judge,
+                    details=f"El caso {case.case_number} fue creado por importación.",
+                )
+                for case in cases
+            ])
+            # bulk_create no envía post_save: se indexa la tanda para la búsqueda
+            # y se recalculan sus días en el resumen diario
+            index_cases(cases)
+            mark_days_changed(registered_day(case.date_registered) for case in cases)
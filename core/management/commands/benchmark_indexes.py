@@ -0,0 +1,160 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.models import AuditLog, Case, CaseLocationBlock
+from core.pagination import encode_cursor, paginate_cases
+from core.services import filter_cases, get_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la latencia de las consultas del panel antes y después de los índices "
+        "de 0005_query_pattern_indexes, sobre una base de datos de prueba temporal."
+    )
+
+    # Índices agregados en 0005 (se quitan para medir "sin índices")
+    benchmark_indexes = {
+        Case: ('case_judge_date_idx', 'case_status_date_idx'),
+        AuditLog: ('auditlog_timestamp_idx', 'auditlog_case_timestamp_idx'),
+    }
+    # Índice simple de la clave foránea judge que existía antes de 0005
+    judge_fk_index = models.Index(fields=['judge'], name='bench_case_judge_id_idx')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cases', type=int, default=100_000, help="Número de casos a generar.")
+        parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por consulta (se reporta la mediana).")
+        parser.add_argument('--explain', action='store_true', help="Muestra el plan (EXPLAIN) de cada consulta.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.populate(options['cases'])
+            self.set_indexes(enabled=False)
+            before = self.run_queries(options['repeat'], options['explain'], 'sin índices')
+            self.set_indexes(enabled=True)
+            after = self.run_queries(options['repeat'], options['explain'], 'con índices')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"\n{options['cases']} casos, backend {connection.vendor}, mediana de {options['repeat']} ejecuciones\n"
+            f"{'Consulta':<40}{'sin índices (ms)':>18}{'con índices (ms)':>18}{'mejora':>10}"
+        )
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            self.stdout.write(f"{name:<40}{before[name]:>18.2f}{after[name]:>18.2f}{speedup:>9.1f}x")
+
+    def set_indexes(self, enabled):
+        """Quita o vuelve a crear los índices de 0005 sobre los datos ya generados"""
+        with connection.schema_editor() as editor:
+            for model, names in self.benchmark_indexes.items():
+                for index in model._meta.indexes:
+                    if index.name in names:
+                        (editor.add_index if enabled else editor.remove_index)(model, index)
+            (editor.remove_index if enabled else editor.add_index)(Case, self.judge_fk_index)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def populate(self, total):
+        self.stdout.write(f"Generando {total} casos...")
+        rng = random.Random(2025)
+        self.judges = [
+            User.objects.create_user(username=f'juez_bench_{index}', password='x')
+            for index in range(20)
+        ]
+        statuses = [code for code, _ in Case.CASE_STATUS]
+        conflict_types = [code for code, _ in Case.CONFLICT_TYPE_CHOICES]
+        blocks = [code for code, _ in Case.BLOCK_CHOICES]
+        start = timezone.now() - timedelta(days=730)
+        minutes = 730 * 24 * 60
+
+        batch_size = 5000
+        for offset in range(0, total, batch_size):
+            cases = []
+            for number in range(offset, min(offset + batch_size, total)):
+                case = Case(
+                    case_number=f'JC-BENCH-{number:07d}',
+                    date_registered=start + timedelta(minutes=rng.randrange(minutes)),
+                    applicant_name='Solicitante',
+                    applicant_id=str(rng.randrange(10 ** 9, 10 ** 10)),
+                    involved_name='Involucrado',
+                    conflict_description='Descripción',
+                    location='Lugar',
+                    status=rng.choice(statuses),
+                    conflict_type=rng.choice(conflict_types),
+                    judge=rng.choice(self.judges),
+                )
+                # bulk_create no llama a save(): la fecha límite se asigna aquí
+                case.due_date = case.calculate_due_date()
+                cases.append(case)
+            Case.objects.bulk_create(cases)
+            CaseLocationBlock.objects.bulk_create(
+                [CaseLocationBlock(case=case, block=rng.choice(blocks)) for case in cases]
+            )
+            AuditLog.objects.bulk_create([
+                AuditLog(action='CREATED', case_number=case.case_number, performed_by=case.judge)
+                for case in cases
+            ])
+
+    def queries(self):
+        today = timezone.localdate()
+        ordered = Case.objects.order_by('-date_registered', '-id')
+        middle = ordered[ordered.count() // 2]
+        return {
+            'judge_panel (primera página)': lambda: paginate_cases(
+                Case.objects.filter(judge=self.judges[0]), {}).object_list,
+            'admin_panel estado=resuelto (página)': lambda: paginate_cases(
+                filter_cases(Case.objects.all(), {'status': 'resuelto'}), {}).object_list,
+            'admin_panel página profunda': lambda: paginate_cases(
+                Case.objects.all(), {'after': encode_cursor(middle)}).object_list,
+            'admin_panel últimos 30 días (stats)': lambda: get_dashboard_stats(
+                filter_cases(Case.objects.all(), {
+                    'date_from': (today - timedelta(days=30)).isoformat(),
+                    'date_to': today.isoformat(),
+                })),
+            'auditoría (últimos 100)': lambda: list(AuditLog.objects.order_by('-timestamp')[:100]),
+            'auditoría por número de caso': lambda: list(
+                AuditLog.objects.filter(case_number='JC-BENCH-0000042').order_by('-timestamp')),
+        }
+
+    def explain_queries(self):
+        """Consultas de queries() que se pueden pasar a EXPLAIN"""
+        today = timezone.localdate()
+        return {
+            'judge_panel (primera página)': Case.objects.filter(judge=self.judges[0])
+            .order_by('-date_registered', '-id')[:51],
+            'admin_panel estado=resuelto (página)': filter_cases(Case.objects.all(), {'status': 'resuelto'})
+            .order_by('-date_registered', '-id')[:51],
+            'admin_panel últimos 30 días': filter_cases(Case.objects.all(), {
+                'date_from': (today - timedelta(days=30)).isoformat(),
+            }),
+            'auditoría (últimos 100)': AuditLog.objects.order_by('-timestamp')[:100],
+            'auditoría por número de caso': AuditLog.objects.filter(case_number='JC-BENCH-0000042'),
+        }
+
+    def run_queries(self, repeat, explain, label):
+        results = {}
+        for name, run in self.queries().items():
+            run()  # calentamiento
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+
+        if explain:
+            self.stdout.write(f"\n== Planes {label} ==")
+            for name, queryset in self.explain_queries().items():
+                self.stdout.write(f"-- {name}\n{queryset.explain()}")
+        return results
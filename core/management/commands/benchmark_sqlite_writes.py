@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+
+from core.models import Case, CaseNumberSequence
+
+
+# Perfiles comparados: la configuración por defecto de Django y la de settings.py
+PROFILES = ('default', 'tuned')
+
+
+def register_case(judge_id, number):
+    """Lo mismo que register_case: número de caso + caso (+ auditoría y resumen diario)"""
+    with transaction.atomic():
+        return Case.objects.create(
+            case_number=CaseNumberSequence.next_case_number(),
+            applicant_name='Solicitante',
+            applicant_id=str(10 ** 9 + number),
+            involved_name='Involucrado',
+            conflict_description='Descripción',
+            location='Lugar',
+            conflict_type='vecinal',
+            judge_id=judge_id,
+        )
+
+
+def edit_case(case_id):
+    """Como admin_edit_case: lee el caso y lo guarda en la misma transacción"""
+    with transaction.atomic():
+        case = Case.objects.get(pk=case_id)
+        case.status = 'resuelto' if case.status != 'resuelto' else 'en_tramite'
+        case.save()
+
+
+def write_worker(args):
+    """Proceso hijo: registra casos hasta el final del tiempo y devuelve sus resultados"""
+    worker, judge_id, start_at, seconds = args
+    # La conexión del proceso padre no se comparte: cada hijo abre la suya
+    connections.close_all()
+    latencies, locked, failed = [], 0, 0
+    time.sleep(max(start_at - time.time(), 0))
+    deadline = start_at + seconds
+    number = worker * 1_000_000
+    case_id = None
+    while time.time() < deadline:
+        # Alterna registros nuevos con ediciones del último caso registrado
+        number += 1
+        began = time.perf_counter()
+        try:
+            if case_id is None or number % 2:
+                case_id = register_case(judge_id, number).pk
+            else:
+                edit_case(case_id)
+        except OperationalError as error:
+            if 'locked' in str(error) or 'busy' in str(error):
+                locked += 1
+            else:
+                failed += 1
+            continue
+        latencies.append((time.perf_counter() - began) * 1000)
+    connections.close_all()
+    return latencies, locked, failed
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide escrituras concurrentes (registro y edición de casos desde varios procesos) en SQLite "
+        "con la configuración por defecto y con los PRAGMA de producción, sobre bases temporales."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help="Procesos escribiendo a la vez.")
+        parser.add_argument('--seconds', type=float, default=10, help="Duración de cada medición.")
+        parser.add_argument('--profile', choices=(*PROFILES, 'both'), default='both', help="Perfil a medir.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Este benchmark solo aplica a SQLite.")
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError("Este benchmark necesita procesos con fork (Linux o macOS).")
+        profiles = PROFILES if options['profile'] == 'both' else (options['profile'],)
+        original = dict(connection.settings_dict)
+        results = {}
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(CASE_DATA_VERSION_FILE=os.path.join(directory, 'cases.version')):
+            try:
+                for profile in profiles:
+                    self.use_database(os.path.join(directory, f'{profile}.sqlite3'), profile, original)
+                    results[profile] = self.run_profile(options['processes'], options['seconds'])
+            finally:
+                connection.close()
+                connection.settings_dict.clear()
+                connection.settings_dict.update(original)
+
+        self.stdout.write(
+            f"\n{options['processes']} procesos, {options['seconds']:g} s por perfil\n"
+            f"{'Perfil':<10}{'journal':>9}{'escrituras':>12}{'por s':>9}{'bloqueos':>10}"
+            f"{'otros':>7}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+        )
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile:<10}{result['journal_mode']:>9}{result['written']:>12}"
+                f"{result['written'] / options['seconds']:>9.1f}{result['locked']:>10}{result['failed']:>7}"
+                f"{result['p50']:>10.1f}{result['p95']:>10.1f}"
+            )
+
+    def use_database(self, path, profile, original):
+        """Apunta la conexión a una base nueva con las opciones del perfil y la migra"""
+        connection.close()
+        options = dict(original.get('OPTIONS', {}))
+        if profile == 'default':
+            options.pop('init_command', None)
+            options.pop('transaction_mode', None)
+        connection.settings_dict.update(NAME=path, OPTIONS=options)
+        self.stdout.write(f"Preparando la base '{profile}'...")
+        call_command('migrate', verbosity=0, interactive=False)
+
+    def run_profile(self, processes, seconds):
+        judge = User.objects.create_user(username='juez_bench', password='x')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        # Ninguna conexión abierta debe pasar a los procesos hijos
+        connection.close()
+        start_at = time.time() + 1
+        jobs = [(worker, judge.pk, start_at, seconds) for worker in range(processes)]
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            outcomes = pool.map(write_worker, jobs)
+
+        latencies = sorted(latency for worker_latencies, _, _ in outcomes for latency in worker_latencies)
+        connection.close()
+        return {
+            'journal_mode': journal_mode,
+            'written': len(latencies),
+            'locked': sum(locked for _, locked, _ in outcomes),
+            'failed': sum(failed for _, _, failed in outcomes),
+            'p50': statistics.median(latencies) if latencies else 0,
+            'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0,
+        }
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from core.benchmarks import BUDGETS, DATASET_SIZES, REGRESSION_TOLERANCE, check_results, run_view_benchmarks
+from core.seed import CaseSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide las vistas de core.urls (latencia p50/p95, consultas SQL, memoria) sobre bases de "
+        "prueba temporales llenadas con seed_cases, guarda los resultados en JSON y falla si "
+        "alguna vista supera su presupuesto o empeora respecto de --baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cases', type=int, nargs='+', default=[DATASET_SIZES[0]],
+            help=f"Tamaños de datos a medir (por ejemplo: {' '.join(map(str, DATASET_SIZES))}).",
+        )
+        parser.add_argument('--repeat', type=int, default=20, help="Peticiones por vista.")
+        parser.add_argument('--seed', type=int, default=2025, help="Semilla de seed_cases.")
+        parser.add_argument('--view', action='append', help="Medir solo esta vista (se puede repetir).")
+        parser.add_argument('--output', default='benchmark_results.json', help="Archivo JSON de resultados.")
+        parser.add_argument('--budgets', help="JSON con presupuestos que reemplazan a los de core/benchmarks.py.")
+        parser.add_argument('--baseline', help="Resultados anteriores (JSON) para detectar regresiones.")
+        parser.add_argument(
+            '--tolerance', type=float, default=REGRESSION_TOLERANCE,
+            help="Empeoramiento de la mediana tolerado frente a --baseline (0.5 = 50%%).",
+        )
+
+    def handle(self, *args, **options):
+        budgets = dict(BUDGETS)
+        if options['budgets']:
+            budgets.update(self.load_json(options['budgets']))
+        baseline = self.load_json(options['baseline'])['datasets'] if options['baseline'] else None
+
+        datasets = {}
+        setup_test_environment()
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            CASE_DATA_VERSION_FILE=os.path.join(directory, 'cases.version'),
+            REPORTS_ROOT=os.path.join(directory, 'reports'),
+        ):
+            try:
+                for cases in sorted(options['cases']):
+                    datasets[str(cases)] = self.run_dataset(cases, options)
+            finally:
+                teardown_test_environment()
+
+        results = {
+            'commit': self.current_commit(),
+            'created': timezone.now().isoformat(),
+            'backend': connection.vendor,
+            'repeat': options['repeat'],
+            'datasets': datasets,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2, ensure_ascii=False)
+        self.stdout.write(f"\nResultados guardados en {options['output']}")
+
+        problems = check_results(datasets, budgets, baseline, options['tolerance'])
+        for problem in problems:
+            self.stderr.write(problem)
+        if problems:
+            raise CommandError(f"{len(problems)} incumplimientos de presupuesto o regresiones.")
+        self.stdout.write(self.style.SUCCESS("Todas las vistas dentro de presupuesto."))
+
+    def run_dataset(self, cases, options):
+        """Base de prueba nueva con `cases` casos; devuelve las métricas de cada vista"""
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Generando {cases} casos...")
+            seeder = CaseSeeder(seed=options['seed'])
+            seeder.create_cases(cases, seeder.create_users(50, 20))
+            caches[getattr(settings, 'DASHBOARD_CACHE', 'default')].clear()
+            results = run_view_benchmarks(options['repeat'], only=options['view'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(
+            f"\n{cases} casos, backend {connection.vendor}, {options['repeat']} peticiones por vista\n"
+            f"{'Vista':<32}{'primera':>9}{'p50':>9}{'p95':>9}{'SQL':>5}{'memoria (KiB)':>15}"
+        )
+        for name, metrics in results.items():
+            self.stdout.write(
+                f"{name:<32}{metrics['first_ms']:>9.1f}{metrics['p50_ms']:>9.1f}{metrics['p95_ms']:>9.1f}"
+                f"{metrics['queries']:>5}{metrics['peak_kib']:>15.1f}"
+            )
+        return results
+
+    def load_json(self, path):
+        try:
+            with open(path, encoding='utf-8') as source:
+                return json.load(source)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"No se pudo leer {path}: {error}")
+
+    def current_commit(self):
+        """Commit de git medido (para comparar resultados entre commits), si hay repositorio"""
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
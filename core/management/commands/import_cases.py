@@ -0,0 +1,57 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import CHUNK_SIZE, MAX_ERRORS, CaseImporter, ImportStats, find_judge, iter_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa casos desde un archivo CSV o NDJSON (use '-' para leer de la entrada estándar). "
+        "Columnas: los nombres de campo de Case (applicant_name, applicant_id, involved_name, "
+        "conflict_description, location, conflict_type, ...), más location_blocks y "
+        "resolution_method separados por ';', judge (usuario), status, extension_granted "
+        "y date_registered (ISO 8601)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Archivo a importar, o '-' para la entrada estándar.")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Formato (por defecto, según la extensión).")
+        parser.add_argument('--judge', help="Usuario del juez asignado a las filas sin columna judge.")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Casos por transacción.")
+        parser.add_argument('--encoding', default='utf-8-sig', help="Codificación del archivo.")
+        parser.add_argument('--max-errors', type=int, default=MAX_ERRORS, help="Errores de fila a mostrar.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+
+        default_judge = None
+        if options['judge']:
+            default_judge = find_judge(options['judge'])
+            if default_judge is None:
+                raise CommandError(f"Juez no encontrado: {options['judge']}")
+
+        importer = CaseImporter(default_judge=default_judge, chunk_size=options['chunk_size'])
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding=options['encoding'])
+        try:
+            stats = importer.run(
+                iter_records(stream, file_format), ImportStats(options['max_errors']), on_chunk=self.report,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for line_number, error in stats.errors:
+            self.stderr.write(f"Línea {line_number}: {error}")
+        if stats.error_count > len(stats.errors):
+            self.stderr.write(f"... y {stats.error_count - len(stats.errors)} errores más.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Importados {stats.imported} de {stats.read} registros en {stats.elapsed:.1f} s "
+            f"({stats.rate:.0f} casos/s). Filas con errores: {stats.error_count}."
+        ))
+
+    def report(self, stats):
+        self.stdout.write(
+            f"{stats.read} registros leídos, {stats.imported} importados ({stats.rate:.0f} casos/s)"
+        )
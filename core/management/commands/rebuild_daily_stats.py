@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el resumen diario de casos (tendencias del dashboard) a partir "
+        "de la tabla de casos. El resumen se mantiene solo; usar tras cargas directas "
+        "en la base de datos o para verificarlo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Alias de la base de datos.")
+
+    def handle(self, *args, **options):
+        total = rebuild_daily_stats(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(f"Resumen diario reconstruido ({total} filas)."))
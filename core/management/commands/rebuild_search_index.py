@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Case
+from core.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el índice de búsqueda de texto completo de los casos. "
+        "Necesario tras cargas masivas (bulk_create/update no envían señales)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Alias de la base de datos.")
+
+    def handle(self, *args, **options):
+        rebuild_search_index(using=options['database'])
+        total = Case.objects.using(options['database']).count()
+        self.stdout.write(self.style.SUCCESS(f"Índice de búsqueda reconstruido ({total} casos)."))
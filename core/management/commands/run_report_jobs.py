@@ -0,0 +1,35 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.reports import KEEP_REPORTS, STALE_AFTER, purge_old_reports, requeue_stale_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de reportes: genera los reportes CSV pedidos desde el panel de "
+        "administración. Sin --once queda atento a la cola. Es el worker aparte "
+        "para REPORTS_IN_PROCESS=0: debe ver el mismo REPORTS_ROOT que la web."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Procesa la cola actual y termina.")
+        parser.add_argument('--interval', type=float, default=5, help="Segundos entre revisiones de la cola.")
+        parser.add_argument('--keep-days', type=int, default=KEEP_REPORTS.days, help="Días que se conservan los reportes generados.")
+
+    def handle(self, *args, **options):
+        keep = timedelta(days=options['keep_days'])
+        while True:
+            requeued = requeue_stale_jobs(STALE_AFTER)
+            if requeued:
+                self.stdout.write(f"Reportes devueltos a la cola: {requeued}.")
+            purge_old_reports(keep)
+            for job in run_pending_jobs():
+                if job.status == 'done':
+                    self.stdout.write(f"Reporte #{job.pk}: {job.row_count} filas ({job.file_name}).")
+                else:
+                    self.stderr.write(f"Reporte #{job.pk} falló: {job.error}")
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,56 @@
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seed import SEED_CHUNK_SIZE, CaseSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Llena la base de datos con jueces, usuarios pendientes y casos sintéticos (con su "
+        "historial de auditoría) para pruebas de carga y benchmarks. Mismo --seed, mismos datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cases', type=int, default=10_000, help="Número de casos a generar.")
+        parser.add_argument('--judges', type=int, default=50, help="Jueces aprobados.")
+        parser.add_argument('--pending-users', type=int, default=20, help="Usuarios pendientes de aprobación.")
+        parser.add_argument('--days', type=int, default=730, help="Días hacia atrás de las fechas de registro.")
+        parser.add_argument('--seed', type=int, default=2025, help="Semilla de los datos aleatorios.")
+        parser.add_argument(
+            '--end-date', type=date.fromisoformat,
+            help="Último día de registro (AAAA-MM-DD, por defecto hoy). Con la misma fecha y seed, mismos datos.",
+        )
+        parser.add_argument('--prefix', default='seed', help="Prefijo de los nombres de usuario generados.")
+        parser.add_argument('--password', default='clave-segura-123', help="Contraseña de los usuarios generados.")
+        parser.add_argument('--chunk-size', type=int, default=SEED_CHUNK_SIZE, help="Casos por transacción.")
+
+    def handle(self, *args, **options):
+        if options['judges'] < 1 and options['cases']:
+            raise CommandError("Se necesita al menos un juez para generar casos.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(
+                f"Ya existen usuarios con el prefijo '{options['prefix']}'. Use otro --prefix."
+            )
+
+        seeder = CaseSeeder(
+            seed=options['seed'], days=options['days'], prefix=options['prefix'],
+            password=options['password'], chunk_size=options['chunk_size'],
+            end_date=options['end_date'],
+        )
+        started = time.monotonic()
+        judges = seeder.create_users(options['judges'], options['pending_users'])
+        created = seeder.create_cases(options['cases'], judges, on_chunk=self.report(started))
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Creados {len(judges)} jueces, {options['pending_users']} usuarios pendientes y "
+            f"{created} casos en {elapsed:.1f} s ({created / elapsed if elapsed else 0:.0f} casos/s)."
+        ))
+
+    def report(self, started):
+        def on_chunk(created):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{created} casos ({created / elapsed if elapsed else 0:.0f} casos/s)")
+        return on_chunk
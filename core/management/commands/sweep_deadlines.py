@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.services import sweep_deadlines
+
+
+class Command(BaseCommand):
+    help = (
+        "Registra en la auditoría los casos abiertos que pasaron a 'por vencer' o "
+        "'vencido' desde la última ejecución. Seguro para ejecutar desde cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Casos procesados por transacción.")
+
+    def handle(self, *args, **options):
+        totals = sweep_deadlines(batch_size=options['batch_size'])
+        self.stdout.write(
+            f"Casos por vencer: {totals['urgente']}. Casos vencidos: {totals['vencido']}."
+        )
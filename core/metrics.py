@@ -0,0 +1,50 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+
+# ----------------------------------------------------------------------------------
+# ✅ MÉTRICAS DE LA PETICIÓN EN CURSO
+# - RequestMetricsMiddleware (core/middleware.py) crea un RequestMetrics por
+#   petición; fuera de ella current_metrics es None y registrar no hace nada
+# - Modelos y servicios solo importan este módulo (no dependen del middleware)
+# ----------------------------------------------------------------------------------
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """Tiempos, consultas y aciertos de caché de una petición"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_ms = 0.0
+        self.queries = Counter()
+        self.slowest = (0.0, '')
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.cache = Counter()
+
+    def record_query(self, sql, duration_ms):
+        self.db_ms += duration_ms
+        self.queries[sql] += 1
+        if duration_ms > self.slowest[0]:
+            self.slowest = (duration_ms, sql)
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    def repeated_queries(self, threshold):
+        """[(sql, veces)] de las consultas idénticas ejecutadas `threshold` veces o más"""
+        return [(sql, times) for sql, times in self.queries.most_common() if times >= threshold]
+
+
+def record_cache(hit):
+    """Registra un acierto o fallo de caché en la petición en curso (si se mide)"""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.cache['hits' if hit else 'misses'] += 1
@@ -0,0 +1,121 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+from .metrics import RequestMetrics, current_metrics
+
+
+logger = logging.getLogger('core.requests')
+
+
+# ----------------------------------------------------------------------------------
+# ✅ MÉTRICAS POR PETICIÓN (opcional: REQUEST_METRICS = True)
+# - Tiempo total, tiempo y número de consultas SQL (execute_wrapper, sin DEBUG),
+#   tiempo de render de plantillas y aciertos/fallos de caché
+# - Se envían en el encabezado Server-Timing (visible en las herramientas del
+#   navegador) y en una línea JSON por petición en el logger 'core.requests'
+# - Aviso (WARNING) si la petición supera REQUEST_METRICS_SLOW_MS o
+#   REQUEST_METRICS_MAX_QUERIES, o si la misma consulta se repite
+#   REQUEST_METRICS_REPEATED_QUERIES veces o más (N+1): se registra la consulta
+# - En respuestas en streaming (exportación CSV) solo se mide hasta que la vista
+#   devuelve la respuesta, no la generación del archivo
+# ----------------------------------------------------------------------------------
+def query_timer(execute, sql, params, many, context):
+    """execute_wrapper: mide cada consulta de la petición"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+def instrument_templates():
+    """Envuelve Template.render una sola vez; solo cuenta la plantilla exterior (no los include)"""
+    if getattr(Template.render, 'request_metrics', False):
+        return
+    render = Template.render
+
+    def timed_render(self, context):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return render(self, context)
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_ms += (time.perf_counter() - started) * 1000
+
+    timed_render.request_metrics = True
+    Template.render = timed_render
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'REQUEST_METRICS_SLOW_MS', 500)
+        self.max_queries = getattr(settings, 'REQUEST_METRICS_MAX_QUERIES', 50)
+        self.repeated_threshold = getattr(settings, 'REQUEST_METRICS_REPEATED_QUERIES', 5)
+        instrument_templates()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(query_timer))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+
+        total_ms = metrics.total_ms
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={total_ms:.1f}',
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.query_count} consultas"',
+            f'tpl;dur={metrics.template_ms:.1f}',
+            f'cache;desc="{metrics.cache["hits"]} aciertos, {metrics.cache["misses"]} fallos"',
+        ])
+        self.log(request, response, metrics, total_ms)
+        return response
+
+    def log(self, request, response, metrics, total_ms):
+        repeated = metrics.repeated_queries(self.repeated_threshold)
+        problems = []
+        if total_ms > self.slow_ms:
+            problems.append('lenta')
+        if metrics.query_count > self.max_queries:
+            problems.append('muchas_consultas')
+        if repeated:
+            problems.append('consultas_repetidas')
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'db_ms': round(metrics.db_ms, 1),
+            'queries': metrics.query_count,
+            'template_ms': round(metrics.template_ms, 1),
+            'cache_hits': metrics.cache['hits'],
+            'cache_misses': metrics.cache['misses'],
+        }
+        if problems:
+            record['problems'] = problems
+            record['slowest_query'] = {'ms': round(metrics.slowest[0], 1), 'sql': metrics.slowest[1]}
+            record['repeated_queries'] = [{'times': times, 'sql': sql} for sql, times in repeated[:3]]
+            logger.warning(json.dumps(record, ensure_ascii=False), extra={'request_metrics': record})
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False), extra={'request_metrics': record})
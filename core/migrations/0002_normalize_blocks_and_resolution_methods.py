@@ -0,0 +1,124 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BLOCK_CODES = {
+    'bloque_15', 'bloque_16', 'bloque_17', 'bloque_22p', 'bloque_23p', 'bloque_24p',
+    'bloque_25p', 'bloque_18', 'bloque_19', 'bloque_20', 'bloque_21', 'otro',
+}
+RESOLUTION_METHOD_CODES = {'conciliacion', 'mediacion', 'equidad', 'otro'}
+
+
+def split_values(raw):
+    if not raw:
+        return []
+    return list(dict.fromkeys(value.strip() for value in raw.split(',') if value.strip()))
+
+
+def normalize_values(values, valid_codes):
+    """
+    Separa los códigos válidos de los textos libres (p. ej. escritos desde el admin).
+    Los textos libres se guardan como "otro" para no perder el dato.
+    """
+    codes = [value for value in values if value in valid_codes]
+    free_text = [value for value in values if value not in valid_codes]
+    if free_text and 'otro' not in codes:
+        codes.append('otro')
+    return codes, ', '.join(free_text)
+
+
+def forwards(apps, schema_editor):
+    Case = apps.get_model('core', 'Case')
+    CaseLocationBlock = apps.get_model('core', 'CaseLocationBlock')
+    CaseResolutionMethod = apps.get_model('core', 'CaseResolutionMethod')
+
+    rows = Case.objects.values_list(
+        'id', 'location_blocks', 'other_location_block',
+        'resolution_method', 'other_resolution_method',
+    )
+    blocks, methods = [], []
+    for case_id, raw_blocks, other_block, raw_methods, other_method in rows.iterator(chunk_size=2000):
+        codes, free_text = normalize_values(split_values(raw_blocks), BLOCK_CODES)
+        blocks.extend(CaseLocationBlock(case_id=case_id, block=code) for code in codes)
+        if free_text and not other_block:
+            Case.objects.filter(id=case_id).update(other_location_block=free_text[:100])
+
+        codes, free_text = normalize_values(split_values(raw_methods), RESOLUTION_METHOD_CODES)
+        methods.extend(CaseResolutionMethod(case_id=case_id, method=code) for code in codes)
+        if free_text and not other_method:
+            Case.objects.filter(id=case_id).update(other_resolution_method=free_text[:100])
+
+        if len(blocks) + len(methods) >= 2000:
+            CaseLocationBlock.objects.bulk_create(blocks)
+            CaseResolutionMethod.objects.bulk_create(methods)
+            blocks, methods = [], []
+
+    CaseLocationBlock.objects.bulk_create(blocks)
+    CaseResolutionMethod.objects.bulk_create(methods)
+
+
+def backwards(apps, schema_editor):
+    Case = apps.get_model('core', 'Case')
+    CaseLocationBlock = apps.get_model('core', 'CaseLocationBlock')
+    CaseResolutionMethod = apps.get_model('core', 'CaseResolutionMethod')
+
+    joined_blocks, joined_methods = {}, {}
+    for case_id, block in CaseLocationBlock.objects.order_by('id').values_list('case_id', 'block'):
+        joined_blocks.setdefault(case_id, []).append(block)
+    for case_id, method in CaseResolutionMethod.objects.order_by('id').values_list('case_id', 'method'):
+        joined_methods.setdefault(case_id, []).append(method)
+
+    for case_id, values in joined_blocks.items():
+        Case.objects.filter(id=case_id).update(location_blocks=', '.join(values))
+    for case_id, values in joined_methods.items():
+        Case.objects.filter(id=case_id).update(resolution_method=', '.join(values))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseLocationBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('block', models.CharField(choices=[('bloque_15', 'BLOQUE 15'), ('bloque_16', 'BLOQUE 16'), ('bloque_17', 'BLOQUE 17'), ('bloque_22p', 'BLOQUE 22 P'), ('bloque_23p', 'BLOQUE 23 P'), ('bloque_24p', 'BLOQUE 24 P'), ('bloque_25p', 'BLOQUE 25 P'), ('bloque_18', 'BLOQUE 18'), ('bloque_19', 'BLOQUE 19'), ('bloque_20', 'BLOQUE 20'), ('bloque_21', 'BLOQUE 21'), ('otro', 'OTRO')], max_length=20, verbose_name='Bloque')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='location_blocks', to='core.case')),
+            ],
+            options={
+                'verbose_name': 'Bloque del caso',
+                'verbose_name_plural': 'Bloques del caso',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['block', 'case'], name='case_block_block_case_idx')],
+                'constraints': [models.UniqueConstraint(fields=('case', 'block'), name='unique_case_location_block')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseResolutionMethod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(choices=[('conciliacion', 'Conciliación'), ('mediacion', 'Mediación'), ('equidad', 'Resolución en equidad'), ('otro', 'Otro')], max_length=20, verbose_name='Medio de resolución')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resolution_methods', to='core.case')),
+            ],
+            options={
+                'verbose_name': 'Medio de resolución del caso',
+                'verbose_name_plural': 'Medios de resolución del caso',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['method', 'case'], name='case_method_method_case_idx')],
+                'constraints': [models.UniqueConstraint(fields=('case', 'method'), name='unique_case_resolution_method')],
+            },
+        ),
+        # ✅ Copia los valores separados por comas a las nuevas tablas
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='case',
+            name='location_blocks',
+        ),
+        migrations.RemoveField(
+            model_name='case',
+            name='resolution_method',
+        ),
+    ]
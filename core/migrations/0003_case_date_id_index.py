@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_normalize_blocks_and_resolution_methods'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['date_registered', 'id'], name='case_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_case_date_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseNumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Año')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Mes')),
+                ('last_value', models.PositiveIntegerField(default=0, verbose_name='Último número asignado')),
+            ],
+            options={
+                'verbose_name': 'Secuencia de números de caso',
+                'verbose_name_plural': 'Secuencias de números de caso',
+                'constraints': [models.UniqueConstraint(fields=('year', 'month'), name='unique_case_number_sequence')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+# SQL fijo de esta migración: no depende de core/search.py, que puede cambiar
+# después. Para reconstruir el índice con el código actual: rebuild_search_index
+PRIMARY_COLUMNS = ('case_number', 'applicant_name', 'applicant_id', 'involved_name', 'involved_id')
+SECONDARY_COLUMNS = ('location', 'conflict_description')
+
+
+def joined(columns):
+    return " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+
+
+# Minúsculas, sin tildes y solo letras y números, como normalize_terms()
+ACCENTED = 'ÁÉÍÓÚÀÈÌÒÙÄËÏÖÜÂÊÎÔÛÑÇáéíóúàèìòùäëïöüâêîôûñç'
+PLAIN = 'AEIOUAEIOUAEIOUAEIOUNCaeiouaeiouaeiouaeiounc'
+
+
+def pg_normalized(columns):
+    return f"regexp_replace(lower(translate({joined(columns)}, '{ACCENTED}', '{PLAIN}')), '[^[:alnum:]]+', ' ', 'g')"
+
+
+SQL = {
+    'sqlite': {
+        'create': [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS core_case_fts USING fts5("
+            "principal, detalle, tokenize='unicode61 remove_diacritics 2')",
+            # El tokenizador ya quita tildes, mayúsculas y signos
+            "INSERT INTO core_case_fts (rowid, principal, detalle) "
+            f"SELECT id, {joined(PRIMARY_COLUMNS)}, {joined(SECONDARY_COLUMNS)} FROM core_case",
+        ],
+        'drop': ["DROP TABLE IF EXISTS core_case_fts"],
+    },
+    'postgresql': {
+        'create': [
+            "CREATE TABLE IF NOT EXISTS core_case_search (case_id bigint PRIMARY KEY, document tsvector NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS core_case_search_document_gin ON core_case_search USING gin (document)",
+            "INSERT INTO core_case_search (case_id, document) "
+            f"SELECT id, setweight(to_tsvector('simple', {pg_normalized(PRIMARY_COLUMNS)}), 'A') || "
+            f"setweight(to_tsvector('simple', {pg_normalized(SECONDARY_COLUMNS)}), 'B') FROM core_case "
+            "ON CONFLICT (case_id) DO UPDATE SET document = EXCLUDED.document",
+        ],
+        'drop': ["DROP TABLE IF EXISTS core_case_search"],
+    },
+}
+
+
+def run(step):
+    def operation(apps, schema_editor):
+        # Otros motores no tienen índice: la búsqueda usa "contiene"
+        for statement in SQL.get(schema_editor.connection.vendor, {}).get(step, []):
+            schema_editor.execute(statement, params=None)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run('create'), run('drop')),
+    ]
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+DEADLINE_DAYS = 15
+EXTENSION_DAYS = 15
+
+
+def fill_due_date(apps, schema_editor):
+    """Fecha límite de los casos existentes: registro + 15 días (30 con prórroga)"""
+    Case = apps.get_model('core', 'Case')
+    cases = Case.objects.using(schema_editor.connection.alias)
+    cases.filter(extension_granted=False).update(
+        due_date=models.F('date_registered') + timedelta(days=DEADLINE_DAYS)
+    )
+    cases.filter(extension_granted=True).update(
+        due_date=models.F('date_registered') + timedelta(days=DEADLINE_DAYS + EXTENSION_DAYS)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_case_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='case',
+            name='date_registered',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Fecha de registro'),
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='due_date',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Fecha límite'),
+        ),
+        migrations.RunPython(fill_due_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='case',
+            name='due_date',
+            field=models.DateTimeField(editable=False, verbose_name='Fecha límite'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['status', 'due_date'], name='case_status_due_idx'),
+        ),
+    ]
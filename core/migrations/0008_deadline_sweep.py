@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_case_due_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='deadline_notified',
+            field=models.CharField(blank=True, choices=[('', 'Sin aviso'), ('urgente', 'Por vencer'), ('vencido', 'Vencido')], default='', editable=False, max_length=10, verbose_name='Último aviso de plazo'),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATED', 'Creado'), ('UPDATED', 'Actualizado'), ('DELETED', 'Eliminado'), ('DUE_SOON', 'Plazo por vencer'), ('OVERDUE', 'Plazo vencido')], max_length=10, verbose_name='Acción'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['deadline_notified', 'status', 'due_date'], name='case_deadline_sweep_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_deadline_sweep'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filters', models.JSONField(blank=True, default=dict, verbose_name='Filtros')),
+                ('filters_hash', models.CharField(max_length=64, verbose_name='Hash de filtros')),
+                ('data_version', models.CharField(max_length=40, verbose_name='Versión de los datos')),
+                ('status', models.CharField(choices=[('pending', 'En cola'), ('running', 'Generando'), ('done', 'Listo'), ('failed', 'Falló')], default='pending', max_length=10, verbose_name='Estado')),
+                ('file_name', models.CharField(blank=True, max_length=200, verbose_name='Archivo')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='Filas')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Solicitado')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminado')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Reporte',
+                'verbose_name_plural': 'Reportes',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reportjob_status_created_idx'), models.Index(fields=['filters_hash', 'data_version'], name='reportjob_cache_key_idx')],
+            },
+        ),
+    ]
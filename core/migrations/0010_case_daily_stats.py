@@ -0,0 +1,80 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+
+def build_daily_stats(apps, schema_editor):
+    """
+    Llena el resumen diario con los casos existentes. Copia fija del cálculo de
+    core/rollups.py, que puede cambiar después: para recalcular con el código
+    actual está el comando rebuild_daily_stats.
+    """
+    using = schema_editor.connection.alias
+    Case = apps.get_model('core', 'Case')
+    CaseDailyStat = apps.get_model('core', 'CaseDailyStat')
+    CaseLocationBlock = apps.get_model('core', 'CaseLocationBlock')
+    totals = (
+        Case.objects.using(using)
+        .annotate(day=TruncDate('date_registered'))
+        .values('day', 'status', 'conflict_type', 'judge')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    blocks = (
+        CaseLocationBlock.objects.using(using)
+        .annotate(day=TruncDate('case__date_registered'))
+        .values(
+            'day', 'block',
+            status=F('case__status'), conflict_type=F('case__conflict_type'), judge=F('case__judge'),
+        )
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    CaseDailyStat.objects.using(using).bulk_create(
+        [
+            CaseDailyStat(
+                day=row['day'],
+                status=row['status'],
+                conflict_type=row['conflict_type'],
+                block=row.get('block', ''),
+                judge_id=row['judge'],
+                count=row['count'],
+            )
+            for rows in (totals, blocks)
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_report_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día de registro')),
+                ('status', models.CharField(choices=[('registrado', 'Registrado'), ('en_tramite', 'En trámite'), ('resuelto', 'Resuelto'), ('cerrado', 'Cerrado')], max_length=20, verbose_name='Estado')),
+                ('conflict_type', models.CharField(choices=[('vecinal', 'Vecinal'), ('individual', 'Individual'), ('comunitario', 'Comunitario'), ('contravencion', 'Contravención sin privación de libertad'), ('patrimonial', 'Obligaciones patrimoniales hasta cinco salarios básicos'), ('otro', 'Otro')], max_length=50, verbose_name='Tipo de conflicto')),
+                ('block', models.CharField(blank=True, max_length=20, verbose_name='Bloque')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Casos')),
+                ('judge', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Juez')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de casos',
+                'verbose_name_plural': 'Resúmenes diarios de casos',
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'conflict_type', 'block', 'judge'), name='unique_case_daily_stat')],
+            },
+        ),
+        migrations.RunPython(build_daily_stats, migrations.RunPython.noop),
+    ]
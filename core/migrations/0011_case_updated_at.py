@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_case_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última modificación'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import migrations, models
+
+import core.models
+from django.db.models import Count, F, Min, Sum
+
+
+def fill_judge_key(apps, schema_editor):
+    """Copia el juez a judge_key (0 = sin juez) y junta las filas repetidas sin juez"""
+    using = schema_editor.connection.alias
+    CaseDailyStat = apps.get_model('core', 'CaseDailyStat')
+    stats = CaseDailyStat.objects.using(using)
+    stats.filter(judge__isnull=False).update(judge_key=F('judge_id'))
+    repeated = (
+        stats.values('day', 'status', 'conflict_type', 'block', 'judge_key')
+        .annotate(rows=Count('id'), total=Sum('count'), keep=Min('id'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for group in repeated:
+        key = {field: group[field] for field in ('day', 'status', 'conflict_type', 'block', 'judge_key')}
+        stats.filter(pk=group['keep']).update(count=group['total'])
+        stats.filter(**key).exclude(pk=group['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_case_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='case',
+            name='judge',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=core.models.unassign_judge, related_name='cases_judge', to=settings.AUTH_USER_MODEL, verbose_name='Juez asignado'),
+        ),
+        migrations.AddField(
+            model_name='casedailystat',
+            name='judge_key',
+            field=models.PositiveIntegerField(default=0, verbose_name='Juez (id; 0 = sin juez)'),
+        ),
+        migrations.RunPython(fill_judge_key, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='casedailystat',
+            name='unique_case_daily_stat',
+        ),
+        migrations.RemoveField(
+            model_name='casedailystat',
+            name='judge',
+        ),
+        migrations.AddConstraint(
+            model_name='casedailystat',
+            constraint=models.UniqueConstraint(
+                fields=('day', 'status', 'conflict_type', 'block', 'judge_key'), name='unique_case_daily_stat'
+            ),
+        ),
+    ]
@@ -1,7 +1,17 @@
-from django.db import models
+import os
+import tempfile
+import time
+
+from django.conf import settings as django_settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Length
 from django.contrib.auth.models import User
 from django.utils import timezone
 import json
+from datetime import timedelta
+
+from .metrics import record_cache
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -37,8 +47,69 @@ class UserProfile(models.Model):
         return dict(self.ROLE_CHOICES).get(self.role_request, self.role_request)
 
 
+# ----------------------------------------------------------------------------------
+# ✅ PLAZOS DE LOS CASOS
+# - Cada caso guarda su fecha límite (due_date): registro + 15 días, o 30 con prórroga
+# - El estado del plazo (vencido / urgente / en tiempo) se calcula en la base de datos
+#   comparando due_date con la hora actual, así los listados pueden filtrar y mostrar
+#   el plazo de cada fila sin recorrer los casos en Python
+# - Solo los casos abiertos (registrado, en trámite) tienen un plazo pendiente
+# ----------------------------------------------------------------------------------
+OPEN_CASE_STATUSES = ('registrado', 'en_tramite')
+
+
+class CaseQuerySet(models.QuerySet):
+
+    def open(self):
+        return self.filter(status__in=Case.OPEN_STATUSES)
+
+    def overdue(self, now=None):
+        """Casos abiertos con el plazo vencido"""
+        return self.open().filter(due_date__lte=now or timezone.now())
+
+    def due_soon(self, now=None):
+        """Casos abiertos que vencen dentro de los próximos URGENT_DAYS días"""
+        now = now or timezone.now()
+        return self.open().filter(due_date__gt=now, due_date__lte=now + timedelta(days=Case.URGENT_DAYS))
+
+    def on_time(self, now=None):
+        now = now or timezone.now()
+        return self.open().filter(due_date__gt=now + timedelta(days=Case.URGENT_DAYS))
+
+    def with_deadline_state(self, now=None):
+        """Anota deadline_state: 'vencido', 'urgente', 'en_tiempo' o None si el caso está cerrado"""
+        now = now or timezone.now()
+        return self.annotate(deadline_state=models.Case(
+            models.When(~models.Q(status__in=Case.OPEN_STATUSES), then=models.Value(None)),
+            models.When(due_date__lte=now, then=models.Value('vencido')),
+            models.When(due_date__lte=now + timedelta(days=Case.URGENT_DAYS), then=models.Value('urgente')),
+            default=models.Value('en_tiempo'),
+            output_field=models.CharField(),
+        ))
+
+    def filter_deadline(self, state, now=None):
+        """Filtra por estado del plazo ('vencido', 'urgente', 'en_tiempo'); otro valor no filtra"""
+        filters = {'vencido': self.overdue, 'urgente': self.due_soon, 'en_tiempo': self.on_time}
+        return filters[state](now) if state in filters else self
+
+
+def unassign_judge(collector, field, sub_objs, using):
+    """
+    on_delete de Case.judge: deja los casos sin juez (como SET_NULL) y recalcula
+    sus días en el resumen diario, que guarda el id del juez sin clave foránea.
+    Una consulta por lote de usuarios borrados, no por usuario.
+    """
+    from .rollups import mark_days_changed, registered_day
+
+    models.SET_NULL(collector, field, sub_objs, using)
+    mark_days_changed(
+        (registered_day(moment) for moment in sub_objs.values_list('date_registered', flat=True)), using=using
+    )
+
+
 class Case(models.Model):
     
+
     # Opciones de estado del caso
     CASE_STATUS = [
         ('registrado', 'Registrado'),
@@ -81,6 +152,25 @@ class Case(models.Model):
         ('otro', 'Otro'),
     ]
 
+    OPEN_STATUSES = OPEN_CASE_STATUSES
+
+    # Plazos en días
+    DEADLINE_DAYS = 15
+    EXTENSION_DAYS = 15
+    URGENT_DAYS = 5
+
+    DEADLINE_NOTICE_CHOICES = [
+        ('', 'Sin aviso'),
+        ('urgente', 'Por vencer'),
+        ('vencido', 'Vencido'),
+    ]
+
+    DEADLINE_STATES = {
+        'vencido': ('Vencido', 'danger'),
+        'urgente': ('Urgente', 'warning'),
+        'en_tiempo': ('En tiempo', 'success'),
+    }
+
     # Campo principal de estado (único, sin duplicados)
     status = models.CharField(
         "Estado",
@@ -89,27 +179,14 @@ class Case(models.Model):
         default='registrado'
     )
     
-    # ✅ CORRECCIÓN CRÍTICA: Aumentar longitud para almacenar múltiples bloques
-    location_blocks = models.CharField(
-        "Bloque(s) donde ocurre el conflicto", 
-        max_length=500,  # ✅ Aumentado de 200 a 500
-        blank=True,
-        null=True
-    )
+    # ✅ Los bloques y medios de resolución seleccionados se guardan en
+    # CaseLocationBlock y CaseResolutionMethod (una fila por valor)
     other_location_block = models.CharField(
         "Otro bloque", 
         max_length=100,
         blank=True,
         null=True
     )
-    
-    # ✅ CORRECCIÓN CRÍTICA: Aumentar longitud para almacenar múltiples métodos
-    resolution_method = models.CharField(
-        "Medio(s) de resolución", 
-        max_length=500,  # ✅ Aumentado para múltiples métodos
-        blank=True,
-        null=True
-    )
     other_resolution_method = models.CharField(
         "Otro medio de resolución", 
         max_length=100,
@@ -119,7 +196,11 @@ class Case(models.Model):
 
     # Número de caso y fecha
     case_number = models.CharField("Número de caso", max_length=20, unique=True, editable=False)
-    date_registered = models.DateTimeField("Fecha de registro", auto_now_add=True)
+    # ✅ Se asigna al crear la instancia (no al guardar) para calcular due_date en save()
+    date_registered = models.DateTimeField("Fecha de registro", default=timezone.now, editable=False)
+    # ✅ Última modificación: base del ETag/Last-Modified de las vistas de detalle.
+    # Las actualizaciones masivas (update()) deben asignarlo explícitamente
+    updated_at = models.DateTimeField("Última modificación", auto_now=True)
 
     # Solicitante
     applicant_name = models.CharField("Nombre del solicitante", max_length=100, blank=False)
@@ -150,20 +231,114 @@ class Case(models.Model):
     # Juez asignado y prórroga
     judge = models.ForeignKey(
         User,
-        on_delete=models.SET_NULL,
+        on_delete=unassign_judge,
         null=True,
         verbose_name="Juez asignado",
-        related_name='cases_judge'
+        related_name='cases_judge',
+        db_index=False  # Cubierto por el índice compuesto case_judge_date_idx
     )
     extension_granted = models.BooleanField("Prórroga concedida", default=False)
+    # ✅ Fecha límite guardada (se recalcula en save() y al conceder prórroga)
+    due_date = models.DateTimeField("Fecha límite", editable=False)
+    # ✅ Último aviso de plazo registrado por el comando sweep_deadlines
+    deadline_notified = models.CharField(
+        "Último aviso de plazo",
+        max_length=10,
+        choices=DEADLINE_NOTICE_CHOICES,
+        blank=True,
+        default='',
+        editable=False
+    )
+
+    objects = CaseQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.case_number} - {self.applicant_name}"
 
+    def save(self, *args, **kwargs):
+        due_date = self.calculate_due_date()
+        if due_date != self.due_date:
+            # Nueva fecha límite: el barrido de plazos vuelve a avisar cuando corresponda
+            self.deadline_notified = ''
+        self.due_date = due_date
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'due_date', 'deadline_notified', 'updated_at'}
+        super().save(*args, **kwargs)
+
+    @property
+    def deadline_days(self):
+        return self.DEADLINE_DAYS + (self.EXTENSION_DAYS if self.extension_granted else 0)
+
+    def calculate_due_date(self):
+        return self.date_registered + timedelta(days=self.deadline_days)
+
+    @classmethod
+    def due_date_expression(cls, extension_granted):
+        """Expresión de due_date para actualizaciones masivas (update())"""
+        days = cls.DEADLINE_DAYS + (cls.EXTENSION_DAYS if extension_granted else 0)
+        return F('date_registered') + timedelta(days=days)
+
+    @property
+    def deadline_badge(self):
+        """(etiqueta, clase CSS) del plazo anotado con with_deadline_state(), o None"""
+        return self.DEADLINE_STATES.get(getattr(self, 'deadline_state', None))
+
+    def get_deadline(self, now=None):
+        """Datos del plazo para las vistas de detalle (días transcurridos, progreso, estado)"""
+        now = now or timezone.now()
+        days_elapsed = (now - self.date_registered).days
+        max_days = self.deadline_days
+        if self.due_date <= now:
+            state = 'vencido'
+        elif self.due_date <= now + timedelta(days=self.URGENT_DAYS):
+            state = 'urgente'
+        else:
+            state = 'en_tiempo'
+        label, css_class = self.DEADLINE_STATES[state]
+        return {
+            'days_elapsed': days_elapsed,
+            'max_days': max_days,
+            'progress': min(int((days_elapsed / max_days) * 100), 100),
+            'deadline_state': state,
+            'deadline_status': label,
+            'deadline_class': css_class,
+        }
+
+    def get_detail_version(self, now=None):
+        """
+        (última modificación, versión) de lo que muestran las vistas de detalle.
+        Cambia al guardar el caso y cuando el plazo avanza solo con el tiempo:
+        un día más transcurrido o el paso a "por vencer" / "vencido".
+        """
+        now = now or timezone.now()
+        deadline = self.get_deadline(now)
+        changes = [self.updated_at, self.date_registered + timedelta(days=max(deadline['days_elapsed'], 0))]
+        if deadline['deadline_state'] == 'urgente':
+            changes.append(self.due_date - timedelta(days=self.URGENT_DAYS))
+        elif deadline['deadline_state'] == 'vencido':
+            changes.append(self.due_date)
+        version = f"{self.pk}:{self.updated_at.isoformat()}:{deadline['days_elapsed']}:{deadline['deadline_state']}"
+        return max(changes), version
+
     class Meta:
         verbose_name = "Caso Comunitario"
         verbose_name_plural = "Casos Comunitarios"
         ordering = ['-date_registered']
+        indexes = [
+            # ✅ Soporta la paginación por cursor (fecha de registro, id) y los
+            # filtros por rango de fechas del panel
+            models.Index(fields=['date_registered', 'id'], name='case_date_id_idx'),
+            # ✅ judge_panel: casos de un juez, más recientes primero
+            models.Index(fields=['judge', 'date_registered', 'id'], name='case_judge_date_idx'),
+            # ✅ admin_panel filtrado por estado, más recientes primero
+            models.Index(fields=['status', 'date_registered', 'id'], name='case_status_date_idx'),
+            # ✅ Casos abiertos vencidos o por vencer
+            models.Index(fields=['status', 'due_date'], name='case_status_due_idx'),
+            # ✅ Barrido de plazos: (aviso pendiente, estado abierto) y rango de fecha límite;
+            # los casos ya avisados o cerrados quedan fuera de los rangos que se leen
+            models.Index(fields=['deadline_notified', 'status', 'due_date'], name='case_deadline_sweep_idx'),
+        ]
     
     def get_status_display(self):
         """Método seguro para obtener el nombre del estado"""
@@ -174,10 +349,10 @@ class Case(models.Model):
         return dict(self.CONFLICT_TYPE_CHOICES).get(self.conflict_type, self.conflict_type)
     
     def get_location_blocks_list(self):
-        """Convierte location_blocks de cadena a lista"""
-        if not self.location_blocks:
+        """Códigos de los bloques del caso (usa prefetch_related('location_blocks') si existe)"""
+        if not self.pk:
             return []
-        return [block.strip() for block in self.location_blocks.split(',') if block.strip()]
+        return [item.block for item in self.location_blocks.all()]
     
     def get_location_blocks_display(self):
         """Convierte los códigos de bloques a nombres legibles"""
@@ -185,16 +360,159 @@ class Case(models.Model):
         return [dict(self.BLOCK_CHOICES).get(block, block) for block in blocks]
     
     def get_resolution_method_list(self):
-        """Convierte resolution_method de cadena a lista"""
-        if not self.resolution_method:
+        """Códigos de los medios de resolución (usa prefetch_related('resolution_methods') si existe)"""
+        if not self.pk:
             return []
-        return [method.strip() for method in self.resolution_method.split(',') if method.strip()]
+        return [item.method for item in self.resolution_methods.all()]
     
     def get_resolution_method_display(self):
         """Convierte los códigos de métodos a nombres legibles"""
         methods = self.get_resolution_method_list()
         return [dict(self.RESOLUTION_METHOD_CHOICES).get(method, method) for method in methods]
 
+    def set_location_blocks(self, blocks):
+        """Deja en el caso exactamente los bloques recibidos (solo escribe las diferencias)"""
+        removed, added = self._replace_related(self.location_blocks, CaseLocationBlock, 'block', blocks)
+        if removed or added:
+            # ✅ El resumen diario cuenta casos por bloque
+            from .rollups import case_blocks_changed
+            case_blocks_changed(self, removed, added)
+
+    def set_resolution_methods(self, methods):
+        """Deja en el caso exactamente los medios de resolución recibidos (solo escribe las diferencias)"""
+        self._replace_related(self.resolution_methods, CaseResolutionMethod, 'method', methods)
+
+    def _replace_related(self, manager, model, field, values):
+        """Devuelve (valores quitados, valores agregados)"""
+        values = list(dict.fromkeys(values))
+        current = set(manager.values_list(field, flat=True))
+        removed = current.difference(values)
+        if removed:
+            manager.filter(**{f'{field}__in': removed}).delete()
+        added = [value for value in values if value not in current]
+        model.objects.bulk_create([model(case=self, **{field: value}) for value in added])
+        return removed, added
+
+
+# ----------------------------------------------------------------------------------
+# ✅ MODELOS: Bloques y medios de resolución de cada caso
+# - Una fila por valor seleccionado (antes era una cadena separada por comas)
+# - Índice (valor, caso) para contar o filtrar casos por bloque/medio directamente
+# ----------------------------------------------------------------------------------
+class CaseLocationBlock(models.Model):
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='location_blocks')
+    block = models.CharField("Bloque", max_length=20, choices=Case.BLOCK_CHOICES)
+
+    def __str__(self):
+        return f"{self.case_id} - {self.get_block_display()}"
+
+    class Meta:
+        verbose_name = "Bloque del caso"
+        verbose_name_plural = "Bloques del caso"
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['case', 'block'], name='unique_case_location_block'),
+        ]
+        indexes = [
+            models.Index(fields=['block', 'case'], name='case_block_block_case_idx'),
+        ]
+
+
+class CaseResolutionMethod(models.Model):
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='resolution_methods')
+    method = models.CharField("Medio de resolución", max_length=20, choices=Case.RESOLUTION_METHOD_CHOICES)
+
+    def __str__(self):
+        return f"{self.case_id} - {self.get_method_display()}"
+
+    class Meta:
+        verbose_name = "Medio de resolución del caso"
+        verbose_name_plural = "Medios de resolución del caso"
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['case', 'method'], name='unique_case_resolution_method'),
+        ]
+        indexes = [
+            models.Index(fields=['method', 'case'], name='case_method_method_case_idx'),
+        ]
+
+# ----------------------------------------------------------------------------------
+# ✅ MODELO: Secuencia de números de caso (JC-AAAA-MM-NNNN)
+# - Un contador por año/mes, incrementado de forma atómica
+# - Evita contar los casos del mes en cada registro y los números duplicados
+#   cuando dos jueces registran un caso al mismo tiempo
+# ----------------------------------------------------------------------------------
+class CaseNumberSequence(models.Model):
+    year = models.PositiveSmallIntegerField("Año")
+    month = models.PositiveSmallIntegerField("Mes")
+    last_value = models.PositiveIntegerField("Último número asignado", default=0)
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02d}: {self.last_value}"
+
+    class Meta:
+        verbose_name = "Secuencia de números de caso"
+        verbose_name_plural = "Secuencias de números de caso"
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month'], name='unique_case_number_sequence'),
+        ]
+
+    @staticmethod
+    def format_case_number(year, month, value):
+        return f"JC-{year}-{month:02d}-{value:04d}"
+
+    @classmethod
+    def _current_max(cls, year, month):
+        """Mayor número ya usado en el mes (para continuar la numeración existente)"""
+        prefix = f"JC-{year}-{month:02d}-"
+        last = (
+            Case.objects.filter(case_number__startswith=prefix)
+            .order_by(Length('case_number').desc(), '-case_number')
+            .values_list('case_number', flat=True)
+            .first()
+        )
+        if not last:
+            return 0
+        try:
+            return int(last[len(prefix):])
+        except ValueError:
+            return 0
+
+    @classmethod
+    def allocate(cls, year, month, count=1):
+        """
+        Reserva `count` números consecutivos para el mes y devuelve el primero.
+        Debe llamarse dentro de la misma transacción que inserta el caso: el
+        UPDATE bloquea la fila del contador hasta que la transacción termina.
+        """
+        with transaction.atomic():
+            updated = cls.objects.filter(year=year, month=month).update(
+                last_value=F('last_value') + count
+            )
+            if not updated:
+                try:
+                    # Primer caso del mes: se crea el contador una sola vez
+                    with transaction.atomic():
+                        cls.objects.create(
+                            year=year, month=month,
+                            last_value=cls._current_max(year, month) + count
+                        )
+                except IntegrityError:
+                    # Otro proceso lo creó al mismo tiempo
+                    cls.objects.filter(year=year, month=month).update(
+                        last_value=F('last_value') + count
+                    )
+            last_value = cls.objects.filter(year=year, month=month).values_list('last_value', flat=True).get()
+        return last_value - count + 1
+
+    @classmethod
+    def next_case_number(cls, moment=None):
+        """Asigna el siguiente número de caso para el mes de `moment` (por defecto, ahora)"""
+        moment = moment or timezone.now()
+        value = cls.allocate(moment.year, moment.month)
+        return cls.format_case_number(moment.year, moment.month, value)
+
+
 # ----------------------------------------------------------------------------------
 # ✅ MODELO: Auditoría de Acciones
 # - Registra quién hizo qué y cuándo
@@ -205,6 +523,8 @@ class AuditLog(models.Model):
         ('CREATED', 'Creado'),
         ('UPDATED', 'Actualizado'),
         ('DELETED', 'Eliminado'),
+        ('DUE_SOON', 'Plazo por vencer'),
+        ('OVERDUE', 'Plazo vencido'),
     ]
 
     action = models.CharField("Acción", max_length=10, choices=ACTION_CHOICES)
@@ -221,6 +541,88 @@ class AuditLog(models.Model):
         verbose_name = "Registro de Auditoría"
         verbose_name_plural = "Registros de Auditoría"
         ordering = ['-timestamp']
+        indexes = [
+            # ✅ Listado del admin, siempre ordenado por fecha descendente
+            models.Index(fields=['-timestamp'], name='auditlog_timestamp_idx'),
+            # ✅ Historial de un caso
+            models.Index(fields=['case_number', '-timestamp'], name='auditlog_case_timestamp_idx'),
+        ]
+
+
+# ----------------------------------------------------------------------------------
+# ✅ MODELO: Resumen diario de casos (tendencias del dashboard)
+# - Una fila por día de registro × estado × tipo de conflicto × bloque × juez
+# - block = '' es el total del grupo (cada caso cuenta una vez); las filas con
+#   bloque cuentan los casos de ese bloque (un caso puede estar en varios)
+# - judge_key guarda el id del juez y NO_JUDGE (0) los casos sin juez: con un
+#   NULL la restricción única no evitaría filas repetidas (NULL ≠ NULL en SQL)
+# - Se mantiene al crear, editar o borrar casos (core/rollups.py); los gráficos
+#   de tendencias leen solo esta tabla, no Case
+# ----------------------------------------------------------------------------------
+class CaseDailyStat(models.Model):
+    NO_JUDGE = 0
+
+    day = models.DateField("Día de registro")
+    status = models.CharField("Estado", max_length=20, choices=Case.CASE_STATUS)
+    conflict_type = models.CharField("Tipo de conflicto", max_length=50, choices=Case.CONFLICT_TYPE_CHOICES)
+    block = models.CharField("Bloque", max_length=20, blank=True)
+    judge_key = models.PositiveIntegerField("Juez (id; 0 = sin juez)", default=NO_JUDGE)
+    count = models.PositiveIntegerField("Casos", default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.status} {self.conflict_type} {self.block or 'total'}: {self.count}"
+
+    class Meta:
+        verbose_name = "Resumen diario de casos"
+        verbose_name_plural = "Resúmenes diarios de casos"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'conflict_type', 'block', 'judge_key'],
+                name='unique_case_daily_stat',
+            ),
+        ]
+
+
+# ----------------------------------------------------------------------------------
+# ✅ MODELO: Reportes generados en segundo plano
+# - El admin pide un reporte (con los filtros del panel) y un worker
+#   (comando run_report_jobs) lo genera en REPORTS_ROOT
+# - filters_hash + data_version identifican el contenido: si los datos no
+#   cambiaron, se reutiliza el archivo de un reporte anterior
+# ----------------------------------------------------------------------------------
+class ReportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'En cola'),
+        ('running', 'Generando'),
+        ('done', 'Listo'),
+        ('failed', 'Falló'),
+    ]
+
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="Solicitado por")
+    filters = models.JSONField("Filtros", default=dict, blank=True)
+    filters_hash = models.CharField("Hash de filtros", max_length=64)
+    data_version = models.CharField("Versión de los datos", max_length=40)
+    status = models.CharField("Estado", max_length=10, choices=STATUS_CHOICES, default='pending')
+    file_name = models.CharField("Archivo", max_length=200, blank=True)
+    row_count = models.PositiveIntegerField("Filas", default=0)
+    error = models.TextField("Error", blank=True)
+    created_at = models.DateTimeField("Solicitado", auto_now_add=True)
+    started_at = models.DateTimeField("Iniciado", null=True, blank=True)
+    finished_at = models.DateTimeField("Terminado", null=True, blank=True)
+
+    def __str__(self):
+        return f"Reporte #{self.pk} ({self.get_status_display()})"
+
+    class Meta:
+        verbose_name = "Reporte"
+        verbose_name_plural = "Reportes"
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # ✅ Cola del worker: pendientes más antiguos primero
+            models.Index(fields=['status', 'created_at'], name='reportjob_status_created_idx'),
+            # ✅ Reutilizar un reporte con los mismos filtros y datos
+            models.Index(fields=['filters_hash', 'data_version'], name='reportjob_cache_key_idx'),
+        ]
 
 
 # ----------------------------------------------------------------------------------
@@ -272,12 +674,25 @@ class PlatformSettings(models.Model):
             # Evita crear más de un registro
             return
         super().save(*args, **kwargs)
+        # ✅ Invalida la copia en memoria de todos los workers al confirmar
+        PlatformSettings.clear_cache()
+        transaction.on_commit(bump_platform_settings_version)
 
     @classmethod
-    def load(cls):
+    def load(cls, use_cache=True):
         """
-        Obtiene la instancia única de configuración
+        Obtiene la instancia única de configuración.
+        Con use_cache=True se sirve desde memoria mientras la versión publicada
+        en PLATFORM_SETTINGS_VERSION_FILE no cambie (un stat, sin consultas).
+        Use use_cache=False para obtener una copia propia que se va a modificar.
         """
+        version = get_platform_settings_version()
+        hit = use_cache and version is not None and _settings_cache['version'] == version
+        if use_cache:
+            record_cache(hit)
+        if hit:
+            return _settings_cache['obj']
+
         obj, created = cls.objects.get_or_create(
             pk=1,
             defaults={
@@ -285,8 +700,82 @@ class PlatformSettings(models.Model):
                 'secondary_color': '#FFD700'
             }   
         )
+        if version is None:
+            version = bump_platform_settings_version()
+        if use_cache:
+            _settings_cache.update(version=version, obj=obj)
         return obj
 
+    @classmethod
+    def clear_cache(cls):
+        """Descarta la copia en memoria de este proceso"""
+        _settings_cache.update(version=None, obj=None)
+
+
+# ----------------------------------------------------------------------------------
+# ✅ VERSIONES COMPARTIDAS ENTRE WORKERS DE GUNICORN
+# - Cada versión se publica como la fecha de modificación de un archivo pequeño
+# - Cada worker compara esa fecha con la de su copia en memoria o en caché
+# - Configuración de la plataforma: PLATFORM_SETTINGS_VERSION_FILE
+# - Datos de casos (caché del dashboard): CASE_DATA_VERSION_FILE
+# ----------------------------------------------------------------------------------
+_settings_cache = {'version': None, 'obj': None}
+
+
+def _version_file(setting, default_name):
+    return getattr(django_settings, setting, os.path.join(tempfile.gettempdir(), default_name))
+
+
+def read_version(path):
+    """Versión publicada en el archivo, o None si aún no existe"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def bump_version(path):
+    """Publica una nueva versión en el archivo; devuelve None si no se puede escribir"""
+    current = read_version(path) or 0
+    version = max(time.time_ns(), current + 1)
+    try:
+        with open(path, 'a'):
+            pass
+        os.utime(path, ns=(version, version))
+        if (read_version(path) or 0) <= current:
+            # Sistema de archivos con poca resolución de tiempo: avanzar un segundo
+            version = current + 1_000_000_000
+            os.utime(path, ns=(version, version))
+    except OSError:
+        return None
+    return read_version(path)
+
+
+def _platform_settings_version_file():
+    return _version_file('PLATFORM_SETTINGS_VERSION_FILE', 'platform_settings.version')
+
+
+def get_platform_settings_version():
+    """Versión publicada de la configuración, o None si aún no existe"""
+    return read_version(_platform_settings_version_file())
+
+
+def bump_platform_settings_version():
+    """Publica una nueva versión para que todos los workers recarguen la configuración"""
+    # Sin archivo de versión la configuración se lee siempre de la base de datos
+    return bump_version(_platform_settings_version_file())
+
+
+def get_case_data_version():
+    """Versión publicada de los datos de casos (se crea si aún no existe)"""
+    path = _version_file('CASE_DATA_VERSION_FILE', 'case_data.version')
+    return read_version(path) or bump_version(path)
+
+
+def bump_case_data_version():
+    """Publica que los casos cambiaron: invalida las secciones del dashboard en caché"""
+    return bump_version(_version_file('CASE_DATA_VERSION_FILE', 'case_data.version'))
+
 
 # ----------------------------------------------------------------------------------
 # ✅ SEÑALES: Registrar acciones automáticamente
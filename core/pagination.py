@@ -0,0 +1,123 @@
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+
+# ----------------------------------------------------------------------------------
+# ✅ PAGINACIÓN POR CURSOR (keyset) PARA LISTADOS DE CASOS
+# - Orden estable: fecha de registro descendente y, en empate, id descendente
+# - La página siguiente/anterior se pide con ?after=<cursor> o ?before=<cursor>
+# - No usa OFFSET: cada página es un rango del índice (date_registered, id),
+#   por lo que el costo es el mismo en la página 1 que en la 1000
+# - Búsqueda rápida ordenada por relevancia (core.search.rank_cases): el cursor
+#   lleva también search_rank y el orden es (relevancia, fecha, id)
+# ----------------------------------------------------------------------------------
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(case):
+    """Convierte la posición ([relevancia,] fecha, id) de un caso en un cursor para la URL"""
+    raw = f"{case.date_registered.isoformat()}|{case.pk}"
+    rank = getattr(case, 'search_rank', None)
+    if rank is not None:
+        raw = f"{rank!r}|{raw}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ranked=False):
+    """Devuelve (fecha, id), o (relevancia, fecha, id) si ranked, o None si el cursor no es válido"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        if ranked:
+            rank, date_value, pk = parts
+            return float(rank), datetime.fromisoformat(date_value), int(pk)
+        date_value, pk = parts
+        return datetime.fromisoformat(date_value), int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def get_page_size(params):
+    """Tamaño de página: ?page_size=, o CASES_PAGE_SIZE en settings, con un máximo"""
+    default = getattr(settings, 'CASES_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    maximum = getattr(settings, 'CASES_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    try:
+        size = int(params.get('page_size') or default)
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+class CasePage:
+    """Una página de casos con los cursores para navegar a la siguiente/anterior"""
+
+    def __init__(self, object_list, has_next, has_previous, page_size):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.page_size = page_size
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.object_list:
+            return encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.object_list:
+            return encode_cursor(self.object_list[0])
+        return None
+
+
+def after_position(fields, values, direction):
+    """Casos después de la posición (campos, valores) en el orden lexicográfico indicado ('lt' o 'gt')"""
+    condition = Q()
+    for index, field in enumerate(fields):
+        equal = {previous: value for previous, value in zip(fields[:index], values)}
+        condition |= Q(**equal, **{f'{field}__{direction}': values[index]})
+    return condition
+
+
+def paginate_cases(cases, params):
+    """
+    Pagina un queryset de casos (ya filtrado) usando los parámetros
+    after/before/page_size de la petición.
+    """
+    page_size = get_page_size(params)
+    ranked = 'search_rank' in cases.query.annotations
+    fields = ('search_rank', 'date_registered', 'id') if ranked else ('date_registered', 'id')
+    after = decode_cursor(params.get('after') or '', ranked)
+    before = decode_cursor(params.get('before') or '', ranked)
+
+    if before:
+        if not ranked:
+            # La condición redundante ">=" permite buscar el punto de inicio en el índice
+            cases = cases.filter(date_registered__gte=before[0])
+        rows = list(
+            cases.filter(after_position(fields, before, 'gt')).order_by(*fields)[:page_size + 1]
+        )
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        return CasePage(rows, has_next=True, has_previous=has_previous, page_size=page_size)
+
+    cases = cases.order_by(*(f'-{field}' for field in fields))
+    if after:
+        if not ranked:
+            # La condición redundante "<=" permite buscar el punto de inicio en el índice
+            # en lugar de recorrerlo desde el principio
+            cases = cases.filter(date_registered__lte=after[0])
+        cases = cases.filter(after_position(fields, after, 'lt'))
+    rows = list(cases[:page_size + 1])
+    has_next = len(rows) > page_size
+    return CasePage(rows[:page_size], has_next=has_next, has_previous=bool(after), page_size=page_size)
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.utils import timezone
+
+from .exports import iter_cases_csv
+from .models import Case, ReportJob, get_case_data_version
+from .services import filter_cases, parse_filter_date
+
+
+# ----------------------------------------------------------------------------------
+# ✅ REPORTES EN SEGUNDO PLANO
+# - La vista solo registra el pedido (ReportJob); el CSV se genera fuera del ciclo
+#   de la petición, así un reporte grande no demora la respuesta ni queda cortado
+#   por el timeout de Render
+# - Con REPORTS_IN_PROCESS (por defecto), al confirmar el pedido la vista inicia un
+#   hilo del mismo proceso web que procesa la cola. Los archivos quedan en el disco
+#   local (REPORTS_ROOT): sirve mientras la web corre en un solo servidor, como en
+#   render.yaml. Con varios servidores hace falta un almacenamiento compartido y un
+#   worker aparte (comando run_report_jobs) con REPORTS_IN_PROCESS=0
+# - Caché: filtros normalizados (hash) + versión de los datos. Si ya existe un
+#   reporte con la misma clave (listo o en curso) se reutiliza en lugar de
+#   generar otro
+# - Versión de los datos: la misma versión de los datos de casos que usa la caché
+#   del dashboard (get_case_data_version), publicada al confirmar cualquier cambio
+#   de casos. Se vuelve a leer al generar el archivo: si los casos cambiaron
+#   mientras el pedido esperaba en la cola, el reporte queda con la versión nueva
+# ----------------------------------------------------------------------------------
+REPORT_FILTERS = ('status', 'judge', 'date_from', 'date_to', 'q', 'deadline')
+
+DOWNLOAD_NAME = 'reporte_casos_comunitarios.csv'
+
+# Un reporte 'running' más antiguo que esto quedó de un worker que se detuvo
+STALE_AFTER = timedelta(minutes=30)
+
+# Tiempo que se conservan los reportes generados
+KEEP_REPORTS = timedelta(days=7)
+
+logger = logging.getLogger(__name__)
+
+
+def report_storage():
+    """Almacenamiento de los archivos generados (REPORTS_ROOT)"""
+    return FileSystemStorage(location=settings.REPORTS_ROOT)
+
+
+def normalize_filters(params):
+    """Solo los filtros del panel que cambian el resultado, sin valores vacíos"""
+    filters = {}
+    for key in REPORT_FILTERS:
+        value = (params.get(key) or '').strip()
+        if key in ('date_from', 'date_to'):
+            # filter_cases ignora fechas no válidas: no deben cambiar la clave
+            day = parse_filter_date(value)
+            value = day.isoformat() if day else ''
+        if key == 'deadline' and value not in Case.DEADLINE_STATES:
+            value = ''
+        if value:
+            filters[key] = value
+    return filters
+
+
+def filters_hash(filters):
+    return hashlib.sha256(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+
+
+def current_data_version(filters):
+    """
+    Versión del conjunto de datos, o None si no hay versión de los datos de casos.
+    El filtro de plazo depende de la hora actual, así que con ese filtro la
+    versión cambia además cada hora.
+    """
+    version = get_case_data_version()
+    if version is None:
+        return None
+    version = str(version)
+    if 'deadline' in filters:
+        version = f"{version}@{timezone.localtime():%Y%m%d%H}"
+    return version
+
+
+def request_report(params, requested_by=None):
+    """
+    Devuelve (reporte, creado). Si hay un reporte vigente con los mismos filtros
+    y datos (en cola, generándose o listo) se devuelve ese. Sin versión de los
+    datos no se reutiliza ninguno.
+    """
+    filters = normalize_filters(params)
+    key = filters_hash(filters)
+    version = current_data_version(filters)
+    existing = None
+    if version is not None:
+        existing = (
+            ReportJob.objects.filter(filters_hash=key, data_version=version)
+            .exclude(status='failed')
+            .order_by('-created_at', '-id')
+            .first()
+        )
+    if existing is not None and (existing.status != 'done' or report_storage().exists(existing.file_name)):
+        return existing, False
+    job = ReportJob.objects.create(
+        requested_by=requested_by,
+        filters=filters,
+        filters_hash=key,
+        data_version=version or '',
+    )
+    return job, True
+
+
+def claim_next_job():
+    """
+    Toma el reporte en cola más antiguo. El cambio a 'running' es un UPDATE
+    condicionado al estado, así dos workers nunca generan el mismo reporte.
+    """
+    while True:
+        job = ReportJob.objects.filter(status='pending').order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        started_at = timezone.now()
+        claimed = ReportJob.objects.filter(pk=job.pk, status='pending').update(
+            status='running', started_at=started_at
+        )
+        if claimed:
+            job.status, job.started_at = 'running', started_at
+            return job
+
+
+def generate_report(job):
+    """Genera el CSV del reporte en el almacenamiento y lo marca como listo (o fallido)"""
+    try:
+        # Versión leída antes de consultar: los datos del archivo son al menos
+        # tan nuevos como la versión con la que queda guardado
+        job.data_version = current_data_version(job.filters) or ''
+        cases = filter_cases(Case.objects.all(), job.filters)
+        lines = 0
+        # ✅ El CSV se escribe primero en un temporal: en el almacenamiento solo
+        # aparecen archivos completos
+        with tempfile.TemporaryFile(mode='w+b') as buffer:
+            for line in iter_cases_csv(cases):
+                buffer.write(line.encode('utf-8'))
+                lines += 1
+            buffer.seek(0)
+            name = report_storage().save(f"reporte_{job.pk}_{job.filters_hash[:12]}.csv", File(buffer))
+    except Exception as error:
+        job.status, job.error = 'failed', str(error) or error.__class__.__name__
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return job
+
+    job.status, job.file_name, job.row_count = 'done', name, lines - 1
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'file_name', 'row_count', 'data_version', 'finished_at'])
+    return job
+
+
+def requeue_stale_jobs(older_than):
+    """Devuelve a la cola los reportes 'running' de un worker que se detuvo"""
+    return ReportJob.objects.filter(
+        status='running', started_at__lt=timezone.now() - older_than
+    ).update(status='pending', started_at=None)
+
+
+def purge_old_reports(older_than):
+    """Borra los reportes terminados antes del plazo indicado (registro y archivo)"""
+    storage = report_storage()
+    jobs = ReportJob.objects.filter(finished_at__lt=timezone.now() - older_than)
+    for file_name in jobs.exclude(file_name='').values_list('file_name', flat=True):
+        storage.delete(file_name)
+    deleted, _ = jobs.delete()
+    return deleted
+
+
+def run_pending_jobs(limit=None):
+    """Genera los reportes en cola (hasta `limit`) y devuelve los procesados"""
+    processed = []
+    while limit is None or len(processed) < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        processed.append(generate_report(job))
+    return processed
+
+
+def process_queue_in_background():
+    """
+    Procesa la cola en un hilo del proceso web (REPORTS_IN_PROCESS). Varios hilos
+    o workers a la vez no se estorban: cada reporte se toma una sola vez.
+    """
+    def work():
+        try:
+            requeue_stale_jobs(STALE_AFTER)
+            purge_old_reports(KEEP_REPORTS)
+            run_pending_jobs()
+        except Exception:
+            logger.exception("Falló el procesamiento de la cola de reportes")
+        finally:
+            connection.close()
+
+    threading.Thread(target=work, name='report-jobs', daemon=True).start()
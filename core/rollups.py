@@ -0,0 +1,330 @@
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Greatest, TruncDate, TruncMonth, TruncWeek
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Case, CaseDailyStat, CaseLocationBlock, bump_case_data_version
+
+
+# ----------------------------------------------------------------------------------
+# ✅ RESUMEN DIARIO DE CASOS (CaseDailyStat)
+# - Alta, edición o borrado de un caso (señales) y cambio de sus bloques: se suma
+#   o resta 1 en las filas del caso, en la misma transacción. El costo no depende
+#   de cuántos casos hay ese día
+# - Operaciones masivas, importaciones y datos sintéticos (update/bulk_create, sin
+#   señales) marcan sus días: al confirmar se recalculan completos con dos GROUP BY
+#   (totales y bloques). rebuild_daily_stats recalcula todo
+# - Las tendencias del dashboard solo leen esta tabla
+# - Al confirmar cualquier cambio de casos (también los que no tocan el resumen,
+#   como un nombre) se publica una nueva versión de los datos de casos: invalida
+#   las secciones del dashboard en caché (core/dashboard.py) y los reportes
+#   (core/reports.py)
+# ----------------------------------------------------------------------------------
+TREND_MONTHS = 12
+TREND_WEEKS = 12
+
+
+def registered_day(moment):
+    """Día de registro (zona horaria local) de una fecha y hora"""
+    return timezone.localdate(moment)
+
+
+def day_runs(days):
+    """Agrupa los días en rangos consecutivos [(primero, último)]"""
+    runs = []
+    for day in sorted(set(days)):
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def registered_in(field, runs):
+    """Condición de rango sobre la fecha de registro (usa el índice por fecha)"""
+    condition = Q()
+    for first, last in runs:
+        condition |= Q(**{
+            f'{field}__gte': timezone.make_aware(datetime.combine(first, time.min)),
+            f'{field}__lt': timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min)),
+        })
+    return condition
+
+
+def judge_key(judge_id):
+    """Juez de la fila del resumen: CaseDailyStat.NO_JUDGE si el caso no tiene"""
+    return judge_id if judge_id is not None else CaseDailyStat.NO_JUDGE
+
+
+def compute_daily_stats(runs, using=DEFAULT_DB_ALIAS):
+    """Filas del resumen (sin guardar) para los casos registrados en los rangos"""
+    totals = (
+        Case.objects.using(using)
+        .filter(registered_in('date_registered', runs))
+        .annotate(day=TruncDate('date_registered'))
+        .values('day', 'status', 'conflict_type', 'judge')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    blocks = (
+        CaseLocationBlock.objects.using(using)
+        .filter(registered_in('case__date_registered', runs))
+        .annotate(day=TruncDate('case__date_registered'))
+        .values(
+            'day', 'block',
+            status=F('case__status'), conflict_type=F('case__conflict_type'), judge=F('case__judge'),
+        )
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    stats = []
+    for rows in (totals, blocks):
+        for row in rows:
+            stats.append(CaseDailyStat(
+                day=row['day'],
+                status=row['status'],
+                conflict_type=row['conflict_type'],
+                block=row.get('block', ''),
+                judge_key=judge_key(row['judge']),
+                count=row['count'],
+            ))
+    return stats
+
+
+def refresh_daily_stats(days, using=DEFAULT_DB_ALIAS):
+    """Recalcula el resumen de los días indicados; devuelve cuántas filas quedaron"""
+    runs = day_runs(days)
+    if not runs:
+        return 0
+    day_filter = Q()
+    for first, last in runs:
+        day_filter |= Q(day__range=(first, last))
+    with transaction.atomic(using=using):
+        # Se borra primero: en PostgreSQL otro recálculo de los mismos días espera a
+        # que esta transacción confirme, y luego cuenta los datos ya confirmados
+        CaseDailyStat.objects.using(using).filter(day_filter).delete()
+        stats = compute_daily_stats(runs, using=using)
+        CaseDailyStat.objects.using(using).bulk_create(
+            stats, update_conflicts=True,
+            unique_fields=['day', 'status', 'conflict_type', 'block', 'judge_key'], update_fields=['count'],
+        )
+    return len(stats)
+
+
+def mark_days_changed(days, using=DEFAULT_DB_ALIAS):
+    """
+    Recalcula los días después de confirmar la transacción en curso, así el
+    resumen incluye también los bloques guardados después del caso. Luego
+    publica la nueva versión de los datos de casos.
+    """
+    days = set(days)
+    if not days:
+        return
+
+    def apply():
+        refresh_daily_stats(days, using=using)
+        bump_case_data_version()
+
+    transaction.on_commit(apply, using=using)
+
+
+def rebuild_daily_stats(using=DEFAULT_DB_ALIAS):
+    """Reconstruye todo el resumen mes por mes (comando rebuild_daily_stats)"""
+    bounds = Case.objects.using(using).aggregate(first=Min('date_registered'), last=Max('date_registered'))
+    CaseDailyStat.objects.using(using).all().delete()
+    if bounds['first'] is None:
+        return 0
+    first, last = registered_day(bounds['first']), registered_day(bounds['last'])
+    total = 0
+    month = first.replace(day=1)
+    while month <= last:
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        days = [month + timedelta(days=offset) for offset in range((next_month - month).days)]
+        total += refresh_daily_stats(days, using=using)
+        month = next_month
+    return total
+
+
+# Campos de Case que forman la fila del resumen (además de los bloques)
+STAT_FIELDS = {'date_registered', 'status', 'conflict_type', 'judge', 'judge_id'}
+
+
+def case_group(using, case_id):
+    """(día, estado, tipo, juez) guardados del caso, o None si no existe"""
+    row = (
+        Case.objects.using(using).filter(pk=case_id)
+        .values_list('date_registered', 'status', 'conflict_type', 'judge_id').first()
+    )
+    if row is None:
+        return None
+    return (registered_day(row[0]), *row[1:])
+
+
+def case_state(using, case_id):
+    """(grupo, bloques) guardados del caso en una consulta, o None si no existe"""
+    rows = list(
+        Case.objects.using(using).filter(pk=case_id).order_by()
+        .values_list('date_registered', 'status', 'conflict_type', 'judge_id', 'location_blocks__block')
+    )
+    if not rows:
+        return None
+    registered, status, conflict_type, judge_id, _ = rows[0]
+    return (registered_day(registered), status, conflict_type, judge_id), {row[4] for row in rows if row[4]}
+
+
+def stat_keys(group, blocks):
+    """Filas (día, estado, tipo, bloque, juez) en las que cuenta un caso"""
+    day, status, conflict_type, judge_id = group
+    return [(day, status, conflict_type, block, judge_key(judge_id)) for block in ('', *sorted(blocks))]
+
+
+def apply_stat_deltas(deltas, using=DEFAULT_DB_ALIAS):
+    """
+    Suma o resta en las filas del resumen {(día, estado, tipo, bloque, juez): cambio}.
+    Las filas que llegan a 0 se borran.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    stats = CaseDailyStat.objects.using(using)
+    emptied = Q()
+    with transaction.atomic(using=using):
+        for (day, status, conflict_type, block, judge), delta in deltas.items():
+            key = {'day': day, 'status': status, 'conflict_type': conflict_type, 'block': block, 'judge_key': judge}
+            if delta < 0:
+                stats.filter(**key).update(count=Greatest(F('count') + delta, 0))
+                emptied |= Q(**key)
+                continue
+            if stats.filter(**key).update(count=F('count') + delta):
+                continue
+            try:
+                with transaction.atomic(using=using):
+                    stats.create(**key, count=delta)
+            except IntegrityError:
+                # Otra transacción creó la fila a la vez
+                stats.filter(**key).update(count=F('count') + delta)
+        if emptied:
+            stats.filter(emptied, count=0).delete()
+
+
+def publish_case_change(using=DEFAULT_DB_ALIAS):
+    """Publica la nueva versión de los datos de casos al confirmar la transacción"""
+    transaction.on_commit(bump_case_data_version, using=using)
+
+
+def case_blocks_changed(case, removed, added):
+    """Bloques quitados/agregados a un caso ya guardado (Case.set_location_blocks)"""
+    using = case._state.db or DEFAULT_DB_ALIAS
+    publish_case_change(using)
+    group = case_group(using, case.pk)
+    if group is None:
+        return
+    deltas = Counter()
+    for key in stat_keys(group, removed)[1:]:
+        deltas[key] -= 1
+    for key in stat_keys(group, added)[1:]:
+        deltas[key] += 1
+    apply_stat_deltas(deltas, using=using)
+
+
+@receiver(pre_save, sender=Case)
+def rollup_case_before_save(sender, instance, using, update_fields=None, **kwargs):
+    # Fila guardada antes del cambio (None = caso nuevo); no se lee si solo se
+    # guardan campos que no están en el resumen
+    if instance._state.adding:
+        instance._rollup_before = None
+    elif update_fields is not None and not STAT_FIELDS.intersection(update_fields):
+        instance._rollup_before = False
+    else:
+        instance._rollup_before = case_state(using, instance.pk)
+
+
+@receiver(post_save, sender=Case)
+def rollup_case_saved(sender, instance, using, **kwargs):
+    publish_case_change(using)
+    before = instance.__dict__.pop('_rollup_before', False)
+    if before is False:
+        return
+    group = (registered_day(instance.date_registered), instance.status, instance.conflict_type, instance.judge_id)
+    deltas = Counter()
+    # Un caso nuevo aún no tiene bloques: se suman después, en set_location_blocks
+    blocks = set()
+    if before is not None:
+        before_group, blocks = before
+        if before_group == group:
+            return
+        for key in stat_keys(before_group, blocks):
+            deltas[key] -= 1
+    for key in stat_keys(group, blocks):
+        deltas[key] += 1
+    apply_stat_deltas(deltas, using=using)
+
+
+@receiver(pre_delete, sender=Case)
+def rollup_case_before_delete(sender, instance, using, **kwargs):
+    # Antes del borrado en cascada de sus bloques
+    instance._rollup_before = case_state(using, instance.pk)
+
+
+@receiver(post_delete, sender=Case)
+def rollup_case_deleted(sender, instance, using, **kwargs):
+    publish_case_change(using)
+    before = instance.__dict__.pop('_rollup_before', None)
+    if before is None:
+        return
+    apply_stat_deltas(Counter({key: -1 for key in stat_keys(*before)}), using=using)
+
+
+# ----------------------------------------------------------------------------------
+# ✅ TENDENCIAS DEL DASHBOARD
+# - Formato listo para Chart.js: {'labels': [...], 'datasets': [{'label', 'data'}]}
+# - Los periodos sin casos aparecen con 0
+# ----------------------------------------------------------------------------------
+def build_trend(periods, labels, rows, series_field, choices):
+    values = {}
+    for row in rows:
+        values.setdefault(row[series_field], {})[row['period']] = row['total']
+    datasets = [
+        {'label': label, 'data': [values[code].get(period, 0) for period in periods]}
+        for code, label in choices
+        if code in values
+    ]
+    return {'labels': labels, 'datasets': datasets}
+
+
+def monthly_block_trend(months=TREND_MONTHS, today=None):
+    """Casos por mes y bloque en los últimos `months` meses"""
+    today = today or timezone.localdate()
+    start = today.year * 12 + today.month - months
+    periods = [date((start + offset) // 12, (start + offset) % 12 + 1, 1) for offset in range(months)]
+    rows = (
+        CaseDailyStat.objects.filter(day__gte=periods[0])
+        .exclude(block='')
+        .annotate(period=TruncMonth('day'))
+        .values('period', 'block')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    labels = [f"{period:%m/%Y}" for period in periods]
+    return build_trend(periods, labels, rows, 'block', Case.BLOCK_CHOICES)
+
+
+def weekly_status_trend(weeks=TREND_WEEKS, today=None):
+    """Casos registrados por semana (lunes) y estado en las últimas `weeks` semanas"""
+    today = today or timezone.localdate()
+    monday = today - timedelta(days=today.weekday())
+    periods = [monday - timedelta(weeks=weeks - 1 - offset) for offset in range(weeks)]
+    rows = (
+        CaseDailyStat.objects.filter(day__gte=periods[0], block='')
+        .annotate(period=TruncWeek('day'))
+        .values('period', 'status')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    labels = [f"{period:%d/%m}" for period in periods]
+    return build_trend(periods, labels, rows, 'status', Case.CASE_STATUS)
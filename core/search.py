@@ -0,0 +1,258 @@
+import re
+import unicodedata
+
+from django.db import connections, router
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Case
+
+
+# ----------------------------------------------------------------------------------
+# ✅ BÚSQUEDA DE TEXTO COMPLETO DE CASOS
+# - SQLite: tabla virtual FTS5 (core_case_fts), rowid = id del caso
+# - PostgreSQL: tabla core_case_search con un tsvector e índice GIN
+# - Otros motores: búsqueda "contiene" sobre los mismos campos (sin ranking)
+# - Nombres, cédulas, número de caso, lugar y descripción; sin tildes ni mayúsculas
+# - El índice busca palabras por prefijo. Una consulta de solo dígitos y guiones
+#   (cédula o número de caso) también busca "contiene" en esos campos, como la
+#   búsqueda anterior: un sufijo de cédula o un fragmento del medio del número
+# - Se actualiza en cada save/delete de Case (señales al final del archivo)
+# ----------------------------------------------------------------------------------
+PRIMARY_FIELDS = ('case_number', 'applicant_name', 'applicant_id', 'involved_name', 'involved_id')
+SECONDARY_FIELDS = ('location', 'conflict_description')
+
+# Consultas tipo cédula o número de caso y campos donde se buscan como texto
+ID_QUERY = re.compile(r'[\d-]*\d[\d-]*')
+ID_FIELDS = ('case_number', 'applicant_id', 'involved_id')
+
+
+def normalize_terms(text):
+    """Minúsculas, sin tildes y separado en palabras: 'José-Pérez' -> ['jose', 'perez']"""
+    text = unicodedata.normalize('NFKD', str(text or '')).lower()
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'[^\W_]+', text)
+
+
+def build_document(values):
+    """Texto indexado para un caso: (campos principales, campos secundarios)"""
+    primary = ' '.join(' '.join(normalize_terms(values.get(field))) for field in PRIMARY_FIELDS)
+    secondary = ' '.join(' '.join(normalize_terms(values.get(field))) for field in SECONDARY_FIELDS)
+    return primary, secondary
+
+
+class SQLiteBackend:
+    table = 'core_case_fts'
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "principal, detalle, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index(self, cursor, documents):
+        self.remove(cursor, [case_id for case_id, _, _ in documents])
+        cursor.executemany(
+            f"INSERT INTO {self.table} (rowid, principal, detalle) VALUES (%s, %s, %s)",
+            documents,
+        )
+
+    def remove(self, cursor, case_ids):
+        cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(case_id,) for case_id in case_ids])
+
+    def condition(self, terms):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return Q(id__in=RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match]))
+
+    def rank(self, cases, terms):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        # bm25 devuelve valores negativos (más negativo = más relevante)
+        rank = RawSQL(
+            f"SELECT -bm25({self.table}, 10.0, 1.0) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND rowid = {Case._meta.db_table}.id",
+            [match], output_field=FloatField(),
+        )
+        return cases.annotate(search_rank=Coalesce(rank, Value(0.0)))
+
+
+class PostgreSQLBackend:
+    table = 'core_case_search'
+
+    def create(self, cursor):
+        cursor.execute(
+            # Sin clave foránea: el borrado lo hace la señal post_delete y así
+            # TRUNCATE/flush de core_case no depende de esta tabla
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "case_id bigint PRIMARY KEY, document tsvector NOT NULL)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_document_gin ON {self.table} USING gin (document)"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index(self, cursor, documents):
+        cursor.executemany(
+            f"INSERT INTO {self.table} (case_id, document) VALUES (%s, "
+            "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+            "ON CONFLICT (case_id) DO UPDATE SET document = EXCLUDED.document",
+            documents,
+        )
+
+    def remove(self, cursor, case_ids):
+        cursor.execute(f"DELETE FROM {self.table} WHERE case_id = ANY(%s)", [list(case_ids)])
+
+    def tsquery(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def condition(self, terms):
+        return Q(id__in=RawSQL(
+            f"SELECT case_id FROM {self.table} WHERE document @@ to_tsquery('simple', %s)",
+            [self.tsquery(terms)],
+        ))
+
+    def rank(self, cases, terms):
+        rank = RawSQL(
+            # double precision: el valor leído sirve tal cual en el cursor de paginación
+            f"SELECT ts_rank(document, to_tsquery('simple', %s))::double precision FROM {self.table} "
+            f"WHERE case_id = {Case._meta.db_table}.id AND document @@ to_tsquery('simple', %s)",
+            [self.tsquery(terms)] * 2, output_field=FloatField(),
+        )
+        return cases.annotate(search_rank=Coalesce(rank, Value(0.0)))
+
+
+class FallbackBackend:
+    """Motores sin búsqueda de texto completo: filtro "contiene" por cada palabra"""
+
+    def create(self, cursor):
+        pass
+
+    drop = create
+
+    def index(self, cursor, documents):
+        pass
+
+    def remove(self, cursor, case_ids):
+        pass
+
+    def condition(self, terms):
+        condition = Q()
+        for term in terms:
+            any_field = Q()
+            for field in PRIMARY_FIELDS + SECONDARY_FIELDS:
+                any_field |= Q(**{f'{field}__icontains': term})
+            condition &= any_field
+        return condition
+
+    def rank(self, cases, terms):
+        return cases.annotate(search_rank=RawSQL('0', [], output_field=FloatField()))
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend(),
+    'postgresql': PostgreSQLBackend(),
+}
+
+
+def get_backend(connection):
+    return BACKENDS.get(connection.vendor, FallbackBackend())
+
+
+def id_condition(query):
+    """Consulta de solo dígitos y guiones: "contiene" en cédulas y número de caso"""
+    query = (query or '').strip()
+    if not ID_QUERY.fullmatch(query):
+        return None
+    condition = Q()
+    for field in ID_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def search_cases(cases, query, ranked=False):
+    """
+    Filtra un queryset de casos con la búsqueda de texto completo.
+    Cada palabra de la consulta debe aparecer (como prefijo) en el caso; una
+    cédula o número de caso también puede aparecer en cualquier parte del campo.
+    Con ranked=True los resultados se ordenan por relevancia (anotación search_rank).
+    """
+    terms = normalize_terms(query)
+    if not terms:
+        return cases
+    condition = get_backend(connections[cases.db]).condition(terms)
+    by_id = id_condition(query)
+    if by_id is not None:
+        condition |= by_id
+    cases = cases.filter(condition)
+    if ranked:
+        cases = rank_cases(cases, query)
+    return cases
+
+
+def rank_cases(cases, query):
+    """
+    Ordena por relevancia casos ya filtrados con search_cases (anotación search_rank;
+    en empate, los más recientes primero). paginate_cases usa el mismo orden.
+    Los casos que solo coinciden por "contiene" en la cédula o el número quedan
+    con relevancia 0, al final.
+    """
+    terms = normalize_terms(query)
+    if not terms:
+        return cases
+    cases = get_backend(connections[cases.db]).rank(cases, terms)
+    return cases.order_by('-search_rank', '-date_registered', '-id')
+
+
+def index_cases(cases, using=None):
+    """(Re)indexa los casos recibidos (instancias o diccionarios con los campos del documento)"""
+    documents = []
+    for case in cases:
+        values = case if isinstance(case, dict) else {
+            field: getattr(case, field) for field in ('id',) + PRIMARY_FIELDS + SECONDARY_FIELDS
+        }
+        documents.append((values['id'], *build_document(values)))
+    if not documents:
+        return
+    connection = connections[using or router.db_for_write(Case)]
+    with connection.cursor() as cursor:
+        get_backend(connection).index(cursor, documents)
+
+
+def rebuild_search_index(case_model=Case, using='default', chunk_size=2000):
+    """Reconstruye el índice completo (tras migrar, importar o usar bulk_create/update)"""
+    connection = connections[using]
+    backend = get_backend(connection)
+    with connection.cursor() as cursor:
+        backend.drop(cursor)
+        backend.create(cursor)
+    rows = (
+        case_model.objects.using(using)
+        .values('id', *PRIMARY_FIELDS, *SECONDARY_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            index_cases(chunk, using=using)
+            chunk = []
+    index_cases(chunk, using=using)
+
+
+@receiver(post_save, sender=Case)
+def update_case_search_index(sender, instance, using, **kwargs):
+    index_cases([instance], using=using)
+
+
+@receiver(post_delete, sender=Case)
+def remove_case_search_index(sender, instance, using, **kwargs):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        get_backend(connection).remove(cursor, [instance.pk])
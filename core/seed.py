@@ -0,0 +1,240 @@
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    AuditLog, Case, CaseLocationBlock, CaseNumberSequence, CaseResolutionMethod, UserProfile,
+)
+from .rollups import mark_days_changed, registered_day
+from .search import index_cases
+
+
+# ----------------------------------------------------------------------------------
+# ✅ DATOS SINTÉTICOS (comando seed_cases)
+# - Mismo seed y misma fecha final => mismos usuarios, casos y auditoría
+#   (random.Random propio; las fechas se cuentan hacia atrás desde end_date)
+# - Casos en orden cronológico: ids y números de caso siguen la fecha de registro
+# - Inserción por tandas con bulk_create, como la importación (core/imports.py):
+#   números de caso por mes, bloques, medios, auditoría, índice de búsqueda y
+#   resumen diario en la misma transacción
+# - Las fechas de auditoría y updated_at son históricas (no la hora de la carga)
+# ----------------------------------------------------------------------------------
+SEED_CHUNK_SIZE = 5000
+
+FIRST_NAMES = (
+    'José', 'María', 'Luis', 'Ana', 'Carlos', 'Rosa', 'Jorge', 'Carmen', 'Manuel', 'Lucía',
+    'Pedro', 'Elena', 'Miguel', 'Patricia', 'Fernando', 'Gloria', 'Diego', 'Mónica', 'Andrés', 'Verónica',
+)
+LAST_NAMES = (
+    'Pérez', 'González', 'Rodríguez', 'Sánchez', 'Ramírez', 'Torres', 'Flores', 'Rivera', 'Gómez', 'Díaz',
+    'Vera', 'Mendoza', 'Castillo', 'Morales', 'Ortiz', 'Zambrano', 'Cedeño', 'Macías', 'Suárez', 'Andrade',
+)
+STREETS = ('Calle Principal', 'Av. Central', 'Pasaje Los Olivos', 'Calle 10 de Agosto', 'Sector La Loma', 'Manzana 4')
+DESCRIPTIONS = (
+    'Ruido excesivo en horas de la noche',
+    'Disputa por linderos entre vecinos',
+    'Deuda pendiente por arriendo',
+    'Daños a la propiedad por filtración de agua',
+    'Uso indebido de áreas comunales',
+    'Mascotas sin control en la vía pública',
+    'Incumplimiento de acuerdo de pago',
+)
+
+# Pesos relativos de cada opción
+CONFLICT_TYPE_WEIGHTS = {
+    'vecinal': 40, 'comunitario': 20, 'individual': 15, 'patrimonial': 10, 'contravencion': 10, 'otro': 5,
+}
+METHOD_WEIGHTS = {'conciliacion': 50, 'mediacion': 30, 'equidad': 15, 'otro': 5}
+# Estado según la antigüedad: los casos con el plazo cumplido casi siempre terminaron
+RECENT_STATUS_WEIGHTS = {'registrado': 50, 'en_tramite': 42, 'resuelto': 7, 'cerrado': 1}
+OLD_STATUS_WEIGHTS = {'registrado': 4, 'en_tramite': 8, 'resuelto': 45, 'cerrado': 43}
+EXTENSION_RATE = 0.1
+
+
+@contextmanager
+def historical_timestamps(*fields):
+    """Desactiva auto_now/auto_now_add para guardar fechas pasadas con bulk_create"""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def weighted(rng, weights):
+    return rng.choices(tuple(weights), weights=tuple(weights.values()))[0]
+
+
+class CaseSeeder:
+    """Genera jueces, usuarios pendientes y casos con su historial de auditoría"""
+
+    def __init__(self, seed=2025, days=730, prefix='seed', password='clave-segura-123',
+                 chunk_size=SEED_CHUNK_SIZE, end_date=None):
+        self.rng = random.Random(seed)
+        # Usuarios con su propia secuencia: otro prefijo da otras cédulas, los mismos casos
+        self.user_rng = random.Random(f'{seed}:{prefix}')
+        self.days = days
+        self.prefix = prefix
+        self.password = password
+        self.chunk_size = chunk_size
+        # Medianoche del día siguiente a end_date: los datos llegan hasta el final de ese día
+        end_date = end_date or timezone.localdate()
+        self.now = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+        self.block_weights = {code: 1 if code == 'otro' else 10 for code, _ in Case.BLOCK_CHOICES}
+
+    def person(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def id_number(self):
+        return str(self.rng.randrange(10 ** 9, 10 ** 10))
+
+    def create_users(self, judges, pending):
+        """Crea los jueces (aprobados) y los usuarios pendientes; devuelve los jueces"""
+        # Un solo hash para todos: calcular uno por usuario tomaría minutos
+        password = make_password(self.password)
+        id_numbers = self.user_rng.sample(range(10 ** 9, 10 ** 10), judges + pending)
+        specs = [('juez', index, True) for index in range(judges)]
+        specs += [('pendiente', index, False) for index in range(pending)]
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'{self.prefix}_{kind}_{index:04d}', password=password,
+                     email=f'{self.prefix}_{kind}_{index:04d}@example.com')
+                for kind, index, _ in specs
+            ])
+            UserProfile.objects.bulk_create([
+                UserProfile(
+                    user=user,
+                    full_name=self.user_rng.choice(FIRST_NAMES),
+                    last_name=self.user_rng.choice(LAST_NAMES),
+                    id_number=str(number),
+                    date_of_birth=date(1960, 1, 1) + timedelta(days=self.user_rng.randrange(365 * 40)),
+                    role_request='juez',
+                    role='juez' if approved else None,
+                    approved_by_admin=approved,
+                )
+                for user, number, (_, _, approved) in zip(users, id_numbers, specs)
+            ])
+        return users[:judges]
+
+    def registration_dates(self, total):
+        """Fechas de registro ordenadas, con más casos en los meses recientes"""
+        span = self.days * 24 * 3600
+        start = self.now - timedelta(seconds=span)
+        # sqrt(U) concentra los registros hacia el final del periodo (uso creciente)
+        offsets = sorted(span * self.rng.random() ** 0.5 for _ in range(total))
+        return [start + timedelta(seconds=offset) for offset in offsets]
+
+    def build_case(self, judge, registered):
+        """(caso, bloques, medios, [(acción, fecha)]) sin guardar"""
+        rng = self.rng
+        age = self.now - registered
+        recent = age < timedelta(days=Case.DEADLINE_DAYS)
+        status = weighted(rng, RECENT_STATUS_WEIGHTS if recent else OLD_STATUS_WEIGHTS)
+        case = Case(
+            date_registered=registered,
+            applicant_name=self.person(),
+            applicant_id=self.id_number(),
+            applicant_phone=f"09{rng.randrange(10 ** 8):08d}",
+            involved_name=self.person(),
+            involved_id=self.id_number() if rng.random() < 0.7 else None,
+            conflict_description=rng.choice(DESCRIPTIONS),
+            location=f"{rng.choice(STREETS)} y {rng.choice(STREETS)}",
+            conflict_type=weighted(rng, CONFLICT_TYPE_WEIGHTS),
+            status=status,
+            extension_granted=age > timedelta(days=10) and rng.random() < EXTENSION_RATE,
+            judge_id=judge.pk,
+        )
+        case.due_date = case.calculate_due_date()
+
+        blocks = {weighted(rng, self.block_weights) for _ in range(rng.choices((1, 2, 3), (80, 15, 5))[0])}
+        methods = {weighted(rng, METHOD_WEIGHTS) for _ in range(rng.choices((1, 2), (85, 15))[0])}
+
+        # Historial: alta, cambios de estado y avisos de plazo, todos en el pasado
+        events = [('CREATED', registered)]
+        if status != 'registrado':
+            steps = {'en_tramite': 1, 'resuelto': 2, 'cerrado': 3}[status]
+            limit = min(age, timedelta(days=case.deadline_days + 10))
+            moments = sorted(registered + limit * rng.random() for _ in range(steps))
+            events += [('UPDATED', moment) for moment in moments]
+        if status in Case.OPEN_STATUSES:
+            urgent_from = case.due_date - timedelta(days=Case.URGENT_DAYS)
+            if urgent_from <= self.now:
+                events.append(('DUE_SOON', urgent_from))
+                case.deadline_notified = 'urgente'
+            if case.due_date <= self.now:
+                events.append(('OVERDUE', case.due_date))
+                case.deadline_notified = 'vencido'
+        events.sort(key=lambda event: event[1])
+        case.updated_at = max(moment for action, moment in events if action in ('CREATED', 'UPDATED'))
+        return case, blocks, methods, events
+
+    def create_cases(self, total, judges, on_chunk=None):
+        """Genera `total` casos repartidos entre los jueces; devuelve cuántos se crearon"""
+        # Unos jueces atienden más casos que otros
+        judge_weights = [self.rng.uniform(0.3, 1.0) for _ in judges]
+        dates = self.registration_dates(total)
+        created = 0
+        for offset in range(0, total, self.chunk_size):
+            chunk = dates[offset:offset + self.chunk_size]
+            assigned = self.rng.choices(judges, weights=judge_weights, k=len(chunk))
+            items = [self.build_case(judge, registered) for judge, registered in zip(assigned, chunk)]
+            self.save_chunk(items)
+            created += len(items)
+            if on_chunk:
+                on_chunk(created)
+        return created
+
+    def save_chunk(self, items):
+        """Guarda una tanda en una sola transacción (como CaseImporter.save_chunk)"""
+        labels = dict(Case.DEADLINE_NOTICE_CHOICES)
+        with transaction.atomic(), historical_timestamps(
+            Case._meta.get_field('updated_at'), AuditLog._meta.get_field('timestamp'),
+        ):
+            by_month = {}
+            for case, _, _, _ in items:
+                by_month.setdefault((case.date_registered.year, case.date_registered.month), []).append(case)
+            for (year, month), cases in by_month.items():
+                first = CaseNumberSequence.allocate(year, month, count=len(cases))
+                for position, case in enumerate(cases):
+                    case.case_number = CaseNumberSequence.format_case_number(year, month, first + position)
+
+            cases = Case.objects.bulk_create([case for case, _, _, _ in items])
+            CaseLocationBlock.objects.bulk_create([
+                CaseLocationBlock(case_id=case.pk, block=block)
+                for case, (_, blocks, _, _) in zip(cases, items)
+                for block in sorted(blocks)
+            ])
+            CaseResolutionMethod.objects.bulk_create([
+                CaseResolutionMethod(case_id=case.pk, method=method)
+                for case, (_, _, methods, _) in zip(cases, items)
+                for method in sorted(methods)
+            ])
+            details = {
+                'CREATED': "El caso {number} fue creado.",
+                'UPDATED': "El caso {number} fue actualizado.",
+                'DUE_SOON': f"El plazo del caso {{number}} está {labels['urgente'].lower()}: fecha límite {{due}}.",
+                'OVERDUE': f"El plazo del caso {{number}} está {labels['vencido'].lower()}: fecha límite {{due}}.",
+            }
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    action=action,
+                    case_number=case.case_number,
+                    performed_by_id=case.judge_id,
+                    timestamp=moment,
+                    details=details[action].format(
+                        number=case.case_number, due=f"{timezone.localtime(case.due_date):%d/%m/%Y %H:%M}",
+                    ),
+                )
+                for case, (_, _, _, events) in zip(cases, items)
+                for action, moment in events
+            ])
+            index_cases(cases)
+            mark_days_changed(registered_day(case.date_registered) for case in cases)
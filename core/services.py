@@ -0,0 +1,323 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import AuditLog, Case, CaseLocationBlock, UserProfile
+from .rollups import (
+    mark_days_changed, monthly_block_trend, publish_case_change, registered_day, weekly_status_trend,
+)
+from .search import search_cases
+
+
+def parse_filter_date(value):
+    """Convierte 'AAAA-MM-DD' en fecha; devuelve None si está vacío o no es válido"""
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+
+def start_of_day(day):
+    """Inicio del día en la zona horaria actual (con zona horaria)"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# ----------------------------------------------------------------------------------
+# ✅ FILTROS DEL PANEL
+# - Mismos filtros que usa admin_panel (estado, juez, fechas, plazo, búsqueda rápida)
+# - Se reutiliza en cualquier vista que necesite respetar la selección del admin
+# ----------------------------------------------------------------------------------
+def filter_cases(cases, params):
+    """
+    Aplica los filtros del panel de administración a un queryset de casos
+    """
+    status_filter = params.get('status')
+    judge_filter = params.get('judge')
+    date_from = params.get('date_from')
+    date_to = params.get('date_to')
+    query = params.get('q')
+    deadline_filter = params.get('deadline')
+
+    if status_filter:
+        cases = cases.filter(status=status_filter)
+    if judge_filter:
+        cases = cases.filter(judge__username__icontains=judge_filter)
+    # ✅ Las fechas se comparan como rangos de date_registered (no con __date)
+    # para que la consulta pueda usar el índice por fecha de registro
+    date_from = parse_filter_date(date_from)
+    date_to = parse_filter_date(date_to)
+    if date_from:
+        cases = cases.filter(date_registered__gte=start_of_day(date_from))
+    if date_to:
+        cases = cases.filter(date_registered__lt=start_of_day(date_to + timedelta(days=1)))
+    if deadline_filter:
+        # ✅ Vencidos / por vencer: rango sobre el índice (estado, fecha límite)
+        cases = cases.filter_deadline(deadline_filter)
+    if query:
+        # ✅ Búsqueda de texto completo (nombres, cédulas, número, lugar, descripción)
+        cases = search_cases(cases, query)
+    return cases
+
+
+# ----------------------------------------------------------------------------------
+# ✅ ESTADÍSTICAS DEL DASHBOARD
+# - Total, casos por estado, por tipo de conflicto, por bloque y por plazo
+# - Una consulta con agregación condicional (COUNT ... FILTER) sobre Case y, para
+#   los bloques, un GROUP BY sobre CaseLocationBlock limitado a los casos filtrados
+# ----------------------------------------------------------------------------------
+def get_dashboard_stats(cases, breakdowns=True):
+    """
+    Calcula todos los conteos del dashboard sobre el queryset recibido: una
+    consulta, más la de los bloques si se piden los desgloses.
+
+    Retorna un diccionario con:
+    - total: número de casos
+    - by_status: {código de estado: conteo} para todos los estados
+    - by_conflict_type: [(código, conteo)] solo tipos con casos, de mayor a menor
+    - by_block: [(código, conteo)] solo bloques con casos, de mayor a menor
+    - by_deadline: {'vencido': conteo, 'urgente': conteo} de casos abiertos
+
+    Con breakdowns=False se omiten by_conflict_type y by_block (las partes que
+    solo usan los gráficos).
+    """
+    aggregates = {'total': Count('id')}
+    for status, _ in Case.CASE_STATUS:
+        aggregates[f'status_{status}'] = Count('id', filter=Q(status=status))
+    if breakdowns:
+        for conflict_type, _ in Case.CONFLICT_TYPE_CHOICES:
+            aggregates[f'conflict_{conflict_type}'] = Count('id', filter=Q(conflict_type=conflict_type))
+
+    now = timezone.now()
+    is_open = Q(status__in=Case.OPEN_STATUSES)
+    aggregates['deadline_vencido'] = Count('id', filter=is_open & Q(due_date__lte=now))
+    aggregates['deadline_urgente'] = Count('id', filter=is_open & Q(
+        due_date__gt=now, due_date__lte=now + timedelta(days=Case.URGENT_DAYS)
+    ))
+
+    row = cases.order_by().aggregate(**aggregates)
+
+    stats = {
+        'total': row['total'],
+        'by_status': {status: row[f'status_{status}'] for status, _ in Case.CASE_STATUS},
+        'by_deadline': {state: row[f'deadline_{state}'] for state in ('vencido', 'urgente')},
+    }
+    if breakdowns:
+        by_conflict_type = [
+            (conflict_type, row[f'conflict_{conflict_type}'])
+            for conflict_type, _ in Case.CONFLICT_TYPE_CHOICES
+            if row[f'conflict_{conflict_type}']
+        ]
+        # ✅ Un GROUP BY por bloque (índice único caso, bloque), no una subconsulta
+        # por bloque y por caso
+        block_counts = dict(
+            CaseLocationBlock.objects.filter(case__in=cases.order_by().values('pk'))
+            .values('block')
+            .annotate(n=Count('case', distinct=True))
+            .order_by()
+            .values_list('block', 'n')
+        )
+        by_block = [
+            (block, block_counts[block])
+            for block, _ in Case.BLOCK_CHOICES
+            if block_counts.get(block)
+        ]
+        stats['by_conflict_type'] = sorted(by_conflict_type, key=lambda item: -item[1])
+        stats['by_block'] = sorted(by_block, key=lambda item: -item[1])
+    return stats
+
+
+# ----------------------------------------------------------------------------------
+# ✅ DATOS DE LOS GRÁFICOS DEL DASHBOARD (vista chart_data)
+# - La página se muestra sin esperar estas agregaciones; los gráficos se piden
+#   por separado en JSON
+# - Formato de cada gráfico: {'labels': [...], 'values': [...]} o, para las
+#   tendencias, {'labels': [...], 'datasets': [...]}
+# ----------------------------------------------------------------------------------
+CHART_STATUSES = ('en_tramite', 'resuelto', 'cerrado')
+
+
+def get_chart_data(cases):
+    """Series de todos los gráficos del dashboard para el queryset filtrado"""
+    stats = get_dashboard_stats(cases)
+    statuses = [(status, label) for status, label in Case.CASE_STATUS if status in CHART_STATUSES]
+    conflict_choices = dict(Case.CONFLICT_TYPE_CHOICES)
+    block_choices = dict(Case.BLOCK_CHOICES)
+    return {
+        'status': {
+            'labels': [label for _, label in statuses],
+            'values': [stats['by_status'][status] for status, _ in statuses],
+        },
+        'conflict': {
+            'labels': [conflict_choices.get(code, code) for code, _ in stats['by_conflict_type']],
+            'values': [count for _, count in stats['by_conflict_type']],
+        },
+        'block': {
+            'labels': [block_choices.get(code, code) for code, _ in stats['by_block']],
+            'values': [count for _, count in stats['by_block']],
+        },
+        # ✅ Tendencias: solo leen el resumen diario (CaseDailyStat)
+        'monthly_trend': monthly_block_trend(),
+        'weekly_trend': weekly_status_trend(),
+    }
+
+
+# ----------------------------------------------------------------------------------
+# ✅ BARRIDO DE PLAZOS (comando sweep_deadlines)
+# - Busca por conjuntos los casos abiertos que cruzaron el umbral "por vencer" o
+#   "vencido" y que aún no tienen ese aviso (campo deadline_notified)
+# - Por cada tanda: un bulk_create de AuditLog y un UPDATE del aviso, en una transacción
+# - Los casos ya avisados no se vuelven a leer (índice case_deadline_sweep_idx),
+#   así cada ejecución cuesta según los casos que cambian, no según el tamaño de la tabla
+# - Idempotente: si se interrumpe, la siguiente ejecución continúa donde quedó
+# ----------------------------------------------------------------------------------
+DEADLINE_TRANSITIONS = (
+    # (aviso, acción de auditoría, avisos previos que pasan a este)
+    ('vencido', 'OVERDUE', ('', 'urgente')),
+    ('urgente', 'DUE_SOON', ('',)),
+)
+
+
+def pending_deadline_notices(notice, now):
+    """Casos abiertos que deben recibir el aviso `notice` ('urgente' o 'vencido')"""
+    previous = dict((state, before) for state, _, before in DEADLINE_TRANSITIONS)[notice]
+    threshold = now if notice == 'vencido' else now + timedelta(days=Case.URGENT_DAYS)
+    cases = Case.objects.filter(
+        status__in=Case.OPEN_STATUSES,
+        deadline_notified__in=previous,
+        due_date__lte=threshold,
+    )
+    if notice == 'urgente':
+        cases = cases.filter(due_date__gt=now)
+    # Sin orden: cada tanda avisada sale del filtro, el LIMIT toma las siguientes
+    return cases.order_by()
+
+
+def sweep_deadlines(now=None, batch_size=1000):
+    """
+    Registra los cambios de plazo pendientes y devuelve {aviso: casos avisados}.
+    Un caso que pasó directamente a vencido (sin barrido intermedio) solo recibe
+    el aviso de vencido.
+    """
+    now = now or timezone.now()
+    totals = {}
+    for notice, action, _ in DEADLINE_TRANSITIONS:
+        totals[notice] = 0
+        label = dict(Case.DEADLINE_NOTICE_CHOICES)[notice].lower()
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    pending_deadline_notices(notice, now)
+                    .select_for_update(skip_locked=True)
+                    .values_list('id', 'case_number', 'judge_id', 'due_date')[:batch_size]
+                )
+                if not rows:
+                    break
+                AuditLog.objects.bulk_create([
+                    AuditLog(
+                        action=action,
+                        case_number=case_number,
+                        performed_by_id=judge_id,
+                        details=(
+                            f"El plazo del caso {case_number} está {label}: "
+                            f"fecha límite {timezone.localtime(due_date):%d/%m/%Y %H:%M}."
+                        ),
+                    )
+                    for _, case_number, judge_id, due_date in rows
+                ])
+                Case.objects.filter(id__in=[row[0] for row in rows]).update(
+                    deadline_notified=notice, updated_at=timezone.now()
+                )
+                publish_case_change()
+            totals[notice] += len(rows)
+            if len(rows) < batch_size:
+                break
+    return totals
+
+
+# ----------------------------------------------------------------------------------
+# ✅ APROBACIÓN / RECHAZO MASIVO DE USUARIOS PENDIENTES
+# - Solo actúa sobre perfiles aún no aprobados (nunca sobre usuarios activos)
+# - Aprobar: un UPDATE que copia el rol solicitado al rol asignado
+# - Rechazar: un borrado en bloque de los User (el perfil se borra en cascada)
+# - El número de consultas no depende de cuántos perfiles se envían
+# ----------------------------------------------------------------------------------
+def approve_pending_users(profile_ids):
+    """Aprueba los perfiles pendientes recibidos; devuelve cuántos se aprobaron"""
+    return UserProfile.objects.filter(id__in=profile_ids, approved_by_admin=False).update(
+        approved_by_admin=True, role=F('role_request')
+    )
+
+
+def reject_pending_users(profile_ids):
+    """Elimina los usuarios de los perfiles pendientes recibidos; devuelve cuántos se eliminaron"""
+    _, deleted = User.objects.filter(
+        profile__id__in=profile_ids, profile__approved_by_admin=False
+    ).delete()
+    return deleted.get(User._meta.label, 0)
+
+
+# ----------------------------------------------------------------------------------
+# ✅ OPERACIONES MASIVAS SOBRE CASOS (admin_panel)
+# - Reasignar juez, cambiar estado o conceder prórroga a una selección de casos
+# - Un solo UPDATE sobre la selección y un bulk_create de la auditoría:
+#   no se llama a save() por caso, así que no se dispara post_save fila por fila
+# - Los casos que ya tienen el valor pedido se omiten (no generan auditoría)
+# ----------------------------------------------------------------------------------
+BULK_CASE_OPERATIONS = {
+    'reassign_judge': 'Reasignar juez',
+    'set_status': 'Cambiar estado',
+    'grant_extension': 'Conceder prórroga',
+}
+
+
+def bulk_update_cases(cases, operation, value=None, performed_by=None):
+    """
+    Aplica la operación a los casos del queryset y devuelve cuántos cambiaron.
+    Lanza ValueError si la operación o el valor no son válidos.
+    """
+    if operation == 'reassign_judge':
+        judge = User.objects.filter(pk=value, profile__role='juez').first() if str(value).isdigit() else None
+        if judge is None:
+            raise ValueError("Selecciona un juez válido.")
+        cases = cases.exclude(judge=judge)
+        changes = {'judge': judge}
+        details = f"reasignado al juez {judge.username}"
+    elif operation == 'set_status':
+        statuses = dict(Case.CASE_STATUS)
+        if value not in statuses:
+            raise ValueError("Selecciona un estado válido.")
+        cases = cases.exclude(status=value)
+        changes = {'status': value}
+        details = f"cambió al estado {statuses[value]}"
+    elif operation == 'grant_extension':
+        cases = cases.filter(extension_granted=False)
+        changes = {
+            'extension_granted': True,
+            'due_date': Case.due_date_expression(extension_granted=True),
+            'deadline_notified': '',
+        }
+        details = f"recibió una prórroga de {Case.EXTENSION_DAYS} días"
+    else:
+        raise ValueError("Operación no válida.")
+
+    cases = Case.objects.filter(pk__in=cases.order_by().values('pk'))
+    with transaction.atomic():
+        rows = list(cases.select_for_update().values_list('case_number', 'date_registered'))
+        if not rows:
+            return 0
+        cases.update(**changes, updated_at=timezone.now())
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                action='UPDATED',
+                case_number=case_number,
+                performed_by=performed_by,
+                details=f"El caso {case_number} {details} (operación masiva).",
+            )
+            for case_number, _ in rows
+        ])
+        # El UPDATE no envía post_save: se recalculan los días afectados del resumen
+        mark_days_changed(registered_day(date_registered) for _, date_registered in rows)
+    return len(rows)
@@ -15,8 +15,14 @@ urlpatterns = [
     path('request-extension/<int:case_id>/', views.request_extension, name='request_extension'),
     path('approve-user/<int:user_profile_id>/', views.approve_user, name='approve_user'),
     path('reject-user/<int:user_profile_id>/', views.reject_user, name='reject_user'),
+    path('bulk-user-action/', views.bulk_user_action, name='bulk_user_action'),
     path('admin-case-detail/<int:case_id>/', views.admin_case_detail, name='admin_case_detail'),
+    path('chart-data/', views.chart_data, name='chart_data'),
     path('download-cases-csv/', views.download_cases_csv, name='download_cases_csv'),
+    path('request-report/', views.request_report_view, name='request_report'),
+    path('reports/<int:job_id>/status/', views.report_status, name='report_status'),
+    path('reports/<int:job_id>/download/', views.download_report, name='download_report'),
+    path('bulk-case-action/', views.bulk_case_action, name='bulk_case_action'),
     # ✅ Vista de personalización
     path('platform-settings/', views.platform_settings, name='platform_settings'),
     path('recover-password/', views.recover_password, name='recover_password'),
@@ -1,16 +1,35 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from django.contrib.auth import authenticate, login as auth_login
+from django.db import transaction
 from django.db.models import Q
 from django.contrib.auth.models import User
-from .models import Case, UserProfile, PlatformSettings
+from .models import (
+    Case, CaseNumberSequence, ReportJob, UserProfile, PlatformSettings, get_platform_settings_version,
+)
 from .forms import PlatformSettingsForm, UserRegistrationForm, CaseForm
-import csv
+from .services import (
+    BULK_CASE_OPERATIONS, approve_pending_users, bulk_update_cases, filter_cases,
+    get_chart_data, get_dashboard_stats, reject_pending_users,
+)
+from .pagination import paginate_cases
+from .exports import iter_cases_csv
+from .reports import DOWNLOAD_NAME, process_queue_in_background, report_storage, request_report
+from .dashboard import cached_fragment, fragment_key
+from .search import rank_cases, search_cases
+import hashlib
 import json
-from django.http import HttpResponse
-from django.db.models import Count
+import logging
+from datetime import datetime, timezone as dt_timezone
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+logger = logging.getLogger(__name__)
 
 from django.contrib.auth import logout
 
@@ -87,114 +106,90 @@ def admin_panel(request):
 
     settings = PlatformSettings.load()
     pending_users = UserProfile.objects.filter(approved_by_admin=False)
-    cases = Case.objects.all().order_by('-date_registered')
+    cases = filter_cases(Case.objects.select_related('judge').order_by('-date_registered'), request.GET)
+    deadline_filter = request.GET.get('deadline')
 
     status_filter = request.GET.get('status')
     judge_filter = request.GET.get('judge')
     date_from = request.GET.get('date_from')
     date_to = request.GET.get('date_to')
-
-    if status_filter:
-        cases = cases.filter(status=status_filter)
-    if judge_filter:
-        cases = cases.filter(judge__username__icontains=judge_filter)
-    if date_from:
-        cases = cases.filter(date_registered__date__gte=date_from)
-    if date_to:
-        cases = cases.filter(date_registered__date__lte=date_to)
-
     query = request.GET.get('q')
-    if query:
-        cases = cases.filter(
-            Q(case_number__icontains=query) |
-            Q(applicant_id__icontains=query) |
-            Q(involved_id__icontains=query)
+
+    # ✅ Conteos de las tarjetas en una sola consulta, guardados en caché junto con
+    # las tarjetas ya renderizadas; los gráficos se cargan después desde chart_data
+    def build_summary():
+        stats = get_dashboard_stats(cases, breakdowns=False)
+        summary = {
+            'total_cases': stats['total'],
+            'cases_by_status': {
+                label: stats['by_status'][status] for status, label in Case.CASE_STATUS
+            },
+            'cases_by_deadline': stats['by_deadline'],
+        }
+        summary['summary_cards'] = render_to_string(
+            'core/dashboard_cards.html', {**summary, 'CASE_STATUS': Case.CASE_STATUS}
         )
+        return summary
 
-    total_cases = cases.count()
-    cases_by_status = {}
-    for status, label in Case.CASE_STATUS:
-        count = cases.filter(status=status).count()
-        cases_by_status[label] = count
+    # Las tarjetas cuentan vencidos / por vencer: la entrada se renueva cada hora
+    summary = cached_fragment('summary', request.GET, build_summary, hourly=True)
 
-    # ✅ CORRECCIÓN CRÍTICA: Manejo seguro de datos para gráficos
-    # Datos para gráfico de casos por estado
-    status_labels = []  # ✅ Etiquetas: "En trámite", "Resuelto", "Cerrado"
-    status_values = []  # ✅ Valores: 5, 3, 2, etc.
-    
-    # ✅ Solo incluir estos estados en el gráfico
-    relevant_statuses = ['en_tramite', 'resuelto', 'cerrado']
-    for status, label in Case.CASE_STATUS:
-        if status in relevant_statuses:
-            count = cases.filter(status=status).count()
-            status_labels.append(label)
-            status_values.append(count)
-
-    # ✅ CORRECCIÓN CRÍTICA: Manejo seguro de conflict_data
-    # Datos para gráfico de tipos de conflicto
-    conflict_data = (
-        cases
-        .values('conflict_type')
-        .annotate(count=Count('conflict_type'))
-        .order_by('-count')
-    )
-    conflict_labels = []
-    conflict_values = []
-    # ✅ Bucle corregido: for item in conflict_data (no conflict_)
-    for item in conflict_data:
-        label = dict(Case.CONFLICT_TYPE_CHOICES).get(item['conflict_type'], item['conflict_type'])
-        conflict_labels.append(label)
-        conflict_values.append(item['count'])
-        
-    # ✅ CORRECCIÓN CRÍTICA: Manejo seguro de block_data
-    # Datos para gráfico de bloques
-    block_data = (
-        cases
-        .values('location_blocks')
-        .annotate(count=Count('location_blocks'))
-        .order_by('-count')
-    )
-    block_labels = []
-    block_values = []
-    # ✅ Bucle corregido: for item in block_data (no block_)
-    for item in block_data:
-        # Procesar múltiples bloques
-        if item['location_blocks']:
-            blocks = [b.strip() for b in item['location_blocks'].split(',') if b.strip()]
-            for block in blocks:
-                # Convertir el código del bloque a su nombre legible
-                label = dict(Case.BLOCK_CHOICES).get(block, block)
-                if label in block_labels:
-                    idx = block_labels.index(label)
-                    block_values[idx] += item['count']
-                else:
-                    block_labels.append(label)
-                    block_values.append(item['count'])
+    # ✅ Solo se renderiza una página de casos (paginación por cursor); con búsqueda
+    # rápida, los más relevantes primero
+    if query:
+        cases = rank_cases(cases, query)
+    page = paginate_cases(cases.with_deadline_state(), request.GET)
 
     context = {
         'pending_users': pending_users,
-        'cases': cases,
-        'total_cases': total_cases,
-        'cases_by_status': cases_by_status,
+        'cases': page.object_list,
+        'page': page,
+        **summary,
         'CASE_STATUS': Case.CASE_STATUS,
         'all_judges': User.objects.filter(profile__role='juez').distinct(),
         'filter_status': status_filter,
         'filter_judge': judge_filter,
         'filter_date_from': date_from,
         'filter_date_to': date_to,
+        'filter_deadline': deadline_filter,
+        'DEADLINE_STATES': Case.DEADLINE_STATES,
+        'BULK_CASE_OPERATIONS': BULK_CASE_OPERATIONS,
+        'report_jobs': ReportJob.objects.select_related('requested_by')[:5],
         'query': query,
         'settings': settings,
-        # ✅ CORRECCIÓN CRÍTICA: Serialización segura
-        'status_labels': json.dumps(status_labels or []),
-        'status_values': json.dumps(status_values or []),
-        'conflict_labels': json.dumps(conflict_labels or []),
-        'conflict_values': json.dumps(conflict_values or []),
-        'block_labels': json.dumps(block_labels or []),
-        'block_values': json.dumps(block_values or []),
     }
     return render(request, 'core/admin_panel.html', context)
 
 
+# ----------------------------------------------------------------------------------
+# ✅ VISTA: Datos de los gráficos del dashboard (JSON)
+# - El panel la pide después de mostrarse, con los mismos filtros
+# - ETag fuerte = clave de la sección en caché (filtros + versión de los datos de
+#   casos + día actual, ver core/dashboard.py). Si el navegador ya tiene esa
+#   versión responde 304 sin ejecutar ninguna agregación
+# - Si no, el JSON se sirve desde la caché de secciones mientras los datos no cambien
+# ----------------------------------------------------------------------------------
+def chart_data_etag(request):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        return None
+    return fragment_key('charts', request.GET)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=chart_data_etag)
+def chart_data(request):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        return JsonResponse({'error': 'Acceso denegado.'}, status=403)
+    content = cached_fragment(
+        'charts', request.GET,
+        lambda: json.dumps(get_chart_data(filter_cases(Case.objects.all(), request.GET))),
+    )
+    return HttpResponse(content, content_type='application/json')
+
+
 @login_required
 def judge_panel(request):
     profile = getattr(request.user, 'profile', None)
@@ -202,16 +197,25 @@ def judge_panel(request):
         return redirect('core:admin_panel')
 
     settings = PlatformSettings.load()
-    cases = Case.objects.filter(judge=request.user).order_by('-date_registered')
+    cases = Case.objects.filter(judge=request.user).select_related('judge').order_by('-date_registered')
 
     query = request.GET.get('q')
     if query:
-        cases = cases.filter(
-            Q(case_number__icontains=query) |
-            Q(applicant_id__icontains=query)
-        )
+        cases = search_cases(cases, query, ranked=True)
 
-    return render(request, 'core/judge_panel.html', {'cases': cases, 'settings': settings})
+    deadline_filter = request.GET.get('deadline')
+    if deadline_filter:
+        cases = cases.filter_deadline(deadline_filter)
+
+    page = paginate_cases(cases.with_deadline_state(), request.GET)
+
+    return render(request, 'core/judge_panel.html', {
+        'cases': page.object_list,
+        'page': page,
+        'filter_deadline': deadline_filter,
+        'DEADLINE_STATES': Case.DEADLINE_STATES,
+        'settings': settings,
+    })
 
 
 @login_required
@@ -221,41 +225,19 @@ def register_case(request):
         messages.error(request, "No tienes permiso para registrar casos.")
         return redirect('core:admin_panel')
 
-    settings = PlatformSettings.load()
     if request.method == 'POST':
         form = CaseForm(request.POST)
         if form.is_valid():
             case = form.save(commit=False)
             case.judge = request.user
-            now = timezone.now()
-            year = now.year
-            month = now.month
-            count = Case.objects.filter(
-                date_registered__year=year,
-                date_registered__month=month
-            ).count() + 1
-            case.case_number = f"JC-{year}-{month:02d}-{count:04d}"
-            case.save()
 
-            # ✅ CORRECCIÓN CRÍTICA: Manejar resolution_methods como lista vacía si es None
-            resolution_methods = form.cleaned_data.get('resolution_method') or []
-            if resolution_methods:
-                case.resolution_method = ', '.join(resolution_methods)
-                if 'otro' in resolution_methods:
-                    case.other_resolution_method = form.cleaned_data.get('other_resolution_method')
-                case.save()
-
-            if case.conflict_type == 'otro':
-                case.other_conflict_type = form.cleaned_data.get('other_conflict_type')
-                case.save()
-                
-            # ✅ CORRECCIÓN CRÍTICA: Manejar location_blocks como lista vacía si es None
-            location_blocks = form.cleaned_data.get('location_blocks') or []
-            if location_blocks:
-                case.location_blocks = ', '.join(location_blocks)
-                if 'otro' in location_blocks:
-                    case.other_location_block = form.cleaned_data.get('other_location_block')
+            # ✅ El caso se arma completo en memoria y se guarda una sola vez
+            # (un INSERT del caso y un registro de auditoría), junto con el número
+            # de caso, los bloques y los medios de resolución en la misma transacción
+            with transaction.atomic():
+                case.case_number = CaseNumberSequence.next_case_number()
                 case.save()
+                form.save_m2m()
 
             messages.success(request, f'Caso registrado con éxito. Número de caso: {case.case_number}')
             return redirect('core:judge_panel')
@@ -269,7 +251,60 @@ def register_case(request):
     return render(request, 'core/register_case.html', {'form': form, 'settings': settings})
 
 
+# ----------------------------------------------------------------------------------
+# ✅ GET CONDICIONAL EN LAS VISTAS DE DETALLE (ETag / Last-Modified)
+# - Una sola consulta por clave primaria con las columnas del plazo y updated_at
+# - El ETag cambia si cambia el caso, si el plazo avanza (día transcurrido o
+#   estado), si cambia la configuración de la plataforma, o si cambia el usuario
+#   o su token CSRF (la página incluye formularios)
+# - Con mensajes pendientes no se responde 304: deben mostrarse en esta página
+# ----------------------------------------------------------------------------------
+CASE_DETAIL_VERSION_FIELDS = ('updated_at', 'date_registered', 'due_date', 'extension_granted')
+
+
+def case_detail_validators(request, case_id, role):
+    """(ETag, Last-Modified) del detalle del caso, o (None, None) si no aplica"""
+    cached = getattr(request, '_case_detail_validators', None)
+    if cached is not None:
+        return cached
+    validators = (None, None)
+    profile = getattr(request.user, 'profile', None)
+    if profile and profile.role == role and not messages.get_messages(request):
+        cases = Case.objects.only(*CASE_DETAIL_VERSION_FIELDS)
+        if role == 'juez':
+            cases = cases.filter(judge=request.user)
+        case = cases.filter(pk=case_id).first()
+        if case is not None:
+            last_modified, version = case.get_detail_version()
+            settings_version = get_platform_settings_version() or 0
+            last_modified = max(last_modified, datetime.fromtimestamp(settings_version / 1e9, tz=dt_timezone.utc))
+            etag = hashlib.sha256(
+                f"{version}:{settings_version}:{request.user.pk}:{request.META.get('CSRF_COOKIE', '')}".encode()
+            ).hexdigest()
+            validators = (etag, last_modified)
+    request._case_detail_validators = validators
+    return validators
+
+
+def judge_case_etag(request, case_id):
+    return case_detail_validators(request, case_id, 'juez')[0]
+
+
+def judge_case_last_modified(request, case_id):
+    return case_detail_validators(request, case_id, 'juez')[1]
+
+
+def admin_case_etag(request, case_id):
+    return case_detail_validators(request, case_id, 'admin')[0]
+
+
+def admin_case_last_modified(request, case_id):
+    return case_detail_validators(request, case_id, 'admin')[1]
+
+
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=judge_case_etag, last_modified_func=judge_case_last_modified)
 def case_detail(request, case_id):
     profile = getattr(request.user, 'profile', None)
     if not profile or profile.role != 'juez':
@@ -284,30 +319,12 @@ def case_detail(request, case_id):
         messages.error(request, "El caso no existe o no tienes permiso para verlo.")
         return redirect('core:judge_panel')
 
-    days_elapsed = (timezone.now() - case.date_registered).days
-    max_days = 15
-    if case.extension_granted:
-        max_days = 30
-
-    progress = min(int((days_elapsed / max_days) * 100), 100) if max_days > 0 else 0
-
-    if days_elapsed >= max_days:
-        deadline_status = "Vencido"
-        deadline_class = "danger"
-    elif days_elapsed >= max_days - 5:
-        deadline_status = "Urgente"
-        deadline_class = "warning"
-    else:
-        deadline_status = "En tiempo"
-        deadline_class = "success"
+    # ✅ Plazo calculado a partir de la fecha límite guardada (due_date)
+    deadline = case.get_deadline()
 
     return render(request, 'core/case_detail.html', {
         'case': case,
-        'days_elapsed': days_elapsed,
-        'max_days': max_days,
-        'progress': progress,
-        'deadline_status': deadline_status,
-        'deadline_class': deadline_class,
+        **deadline,
         'settings': settings,
     })
 
@@ -319,7 +336,6 @@ def update_case_status(request, case_id):
         messages.error(request, "No tienes permiso para actualizar este caso.")
         return redirect('core:home')
 
-    settings = PlatformSettings.load()
     # ✅ CORRECCIÓN CRÍTICA: Manejo seguro de get_object_or_404
     try:
         case = get_object_or_404(Case, id=case_id, judge=request.user)
@@ -349,7 +365,6 @@ def request_extension(request, case_id):
         messages.error(request, "Acceso denegado.")
         return redirect('core:home')
 
-    settings = PlatformSettings.load()
     # ✅ CORRECCIÓN CRÍTICA: Manejo seguro de get_object_or_404
     try:
         case = get_object_or_404(Case, id=case_id, judge=request.user)
@@ -374,7 +389,6 @@ def approve_user(request, user_profile_id):
         messages.error(request, "Acceso denegado.")
         return redirect('core:home')
 
-    settings = PlatformSettings.load()
     try:
         user_profile = get_object_or_404(UserProfile, id=user_profile_id)
         user_profile.approved_by_admin = True
@@ -398,7 +412,6 @@ def reject_user(request, user_profile_id):
         messages.error(request, "Acceso denegado.")
         return redirect('core:home')
 
-    settings = PlatformSettings.load()
     try:
         user_profile = get_object_or_404(UserProfile, id=user_profile_id)
         user = user_profile.user
@@ -412,7 +425,81 @@ def reject_user(request, user_profile_id):
     return redirect('core:admin_panel')
 
 
+# ----------------------------------------------------------------------------------
+# ✅ APROBAR / RECHAZAR USUARIOS EN BLOQUE (Admin)
+# - Recibe por POST la lista de perfiles seleccionados (profile_ids) y la acción
+# - Todo en una transacción y con un solo mensaje de resumen
+# ----------------------------------------------------------------------------------
+@login_required
+def bulk_user_action(request):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        messages.error(request, "Acceso denegado.")
+        return redirect('core:home')
+
+    if request.method != 'POST':
+        return redirect('core:admin_panel')
+
+    action = request.POST.get('action')
+    profile_ids = [value for value in request.POST.getlist('profile_ids') if value.isdigit()]
+    if not profile_ids or action not in ('approve', 'reject'):
+        messages.warning(request, "Selecciona al menos un usuario y una acción.")
+        return redirect('core:admin_panel')
+
+    with transaction.atomic():
+        if action == 'approve':
+            total = approve_pending_users(profile_ids)
+            messages.success(request, f"{total} usuario(s) aprobado(s) correctamente.")
+        else:
+            total = reject_pending_users(profile_ids)
+            messages.success(request, f"{total} usuario(s) rechazado(s) y eliminado(s) correctamente.")
+
+    return redirect('core:admin_panel')
+
+
+# ----------------------------------------------------------------------------------
+# ✅ OPERACIONES MASIVAS SOBRE CASOS (Admin)
+# - Selección: casos marcados (case_ids) o todos los que cumplen los filtros
+#   actuales del panel (select_all; los filtros llegan en la URL)
+# - Reasignar juez, cambiar estado o conceder prórroga con un solo UPDATE
+# ----------------------------------------------------------------------------------
 @login_required
+def bulk_case_action(request):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        messages.error(request, "Acceso denegado.")
+        return redirect('core:home')
+
+    panel_url = reverse('core:admin_panel')
+    if request.GET:
+        panel_url = f"{panel_url}?{request.GET.urlencode()}"
+    if request.method != 'POST':
+        return redirect(panel_url)
+
+    if request.POST.get('select_all'):
+        cases = filter_cases(Case.objects.all(), request.GET)
+    else:
+        case_ids = [value for value in request.POST.getlist('case_ids') if value.isdigit()]
+        if not case_ids:
+            messages.warning(request, "Selecciona al menos un caso.")
+            return redirect(panel_url)
+        cases = Case.objects.filter(id__in=case_ids)
+
+    operation = request.POST.get('operation')
+    value = {'reassign_judge': request.POST.get('judge'), 'set_status': request.POST.get('status')}.get(operation)
+    try:
+        total = bulk_update_cases(cases, operation, value, performed_by=request.user)
+    except ValueError as error:
+        messages.error(request, str(error))
+    else:
+        label = BULK_CASE_OPERATIONS[operation]
+        messages.success(request, f"{label}: {total} caso(s) actualizado(s).")
+    return redirect(panel_url)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=admin_case_etag, last_modified_func=admin_case_last_modified)
 def admin_case_detail(request, case_id):
     profile = getattr(request.user, 'profile', None)
     if not profile or profile.role != 'admin':
@@ -427,30 +514,12 @@ def admin_case_detail(request, case_id):
         messages.error(request, "El caso no existe.")
         return redirect('core:admin_panel')
 
-    days_elapsed = (timezone.now() - case.date_registered).days
-    max_days = 15
-    if case.extension_granted:
-        max_days = 30
-
-    progress = min(int((days_elapsed / max_days) * 100), 100) if max_days > 0 else 0
-
-    if days_elapsed >= max_days:
-        deadline_status = "Vencido"
-        deadline_class = "danger"
-    elif days_elapsed >= max_days - 5:
-        deadline_status = "Urgente"
-        deadline_class = "warning"
-    else:
-        deadline_status = "En tiempo"
-        deadline_class = "success"
+    # ✅ Plazo calculado a partir de la fecha límite guardada (due_date)
+    deadline = case.get_deadline()
 
     return render(request, 'core/admin_case_detail.html', {
         'case': case,
-        'days_elapsed': days_elapsed,
-        'max_days': max_days,
-        'progress': progress,
-        'deadline_status': deadline_status,
-        'deadline_class': deadline_class,
+        **deadline,
         'settings': settings,
     })
 # ----------------------------------------------------------------------------------
@@ -475,50 +544,21 @@ def edit_case(request, case_id):
     if request.method == 'POST':
         form = CaseForm(request.POST, instance=case)
         if form.is_valid():
-            # Guardamos el caso, pero sin guardar aún en la base de datos
-            case = form.save(commit=False)
-
-            # Actualizamos resolution_method (si aplica)
-            resolution_methods = form.cleaned_data.get('resolution_method') or []
-            if resolution_methods:
-                case.resolution_method = ', '.join(resolution_methods)
-                if 'otro' in resolution_methods:
-                    case.other_resolution_method = form.cleaned_data.get('other_resolution_method')
-
-            # Actualizamos other_conflict_type si el tipo es "otro"
-            if case.conflict_type == 'otro':
-                case.other_conflict_type = form.cleaned_data.get('other_conflict_type')
-                
-            # ✅ Actualizamos location_blocks
-            location_blocks = form.cleaned_data.get('location_blocks') or []
-            if location_blocks:
-                case.location_blocks = ', '.join(location_blocks)
-                if 'otro' in location_blocks:
-                    case.other_location_block = form.cleaned_data.get('other_location_block')
-
-            # Guardamos el caso en la base de datos
-            case.save()
+            # ✅ Un solo UPDATE del caso (y un registro de auditoría); bloques y medios
+            # de resolución solo escriben lo que cambió, todo en una transacción
+            with transaction.atomic():
+                case = form.save()
 
             # Mensaje de éxito y redirección
             messages.success(request, f"Caso {case.case_number} actualizado correctamente.")
             return redirect('core:admin_case_detail', case_id=case.id)
         else:
-            # Mostrar errores en consola (opcional, para depurar)
-            print("Errores del formulario:", form.errors)
+            logger.warning("Errores del formulario al editar el caso %s: %s", case.case_number, form.errors.as_json())
             messages.error(request, "Por favor corrige los errores del formulario.")
     else:
         # Si es GET, mostramos el formulario con los datos actuales
+        # (los checkboxes de bloques y resolución se inicializan en el formulario)
         form = CaseForm(instance=case)
-        # Inicializamos los checkboxes de resolución
-        if case.resolution_method:
-            form.fields['resolution_method'].initial = [
-                method.strip() for method in case.resolution_method.split(',') if method.strip()
-            ]
-        # ✅ Inicializamos los checkboxes de bloques
-        if case.location_blocks:
-            form.fields['location_blocks'].initial = [
-                block.strip() for block in case.location_blocks.split(',') if block.strip()
-            ]
 
     # Cargamos la configuración de la plataforma
     settings = PlatformSettings.load()
@@ -564,40 +604,81 @@ def download_cases_csv(request):
     if not profile or profile.role != 'admin':
         return redirect('core:home')
 
-    settings = PlatformSettings.load()
-    cases = Case.objects.all().order_by('-date_registered')
+    # ✅ Respeta los mismos filtros que el panel (estado, juez, fechas, búsqueda)
+    cases = filter_cases(Case.objects.all(), request.GET)
 
-    response = HttpResponse(content_type='text/csv')
+    # ✅ Respuesta en streaming: el encabezado se envía de inmediato y las filas
+    # se generan por tandas, sin cargar todo el reporte en memoria
+    response = StreamingHttpResponse(iter_cases_csv(cases), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="reporte_casos_comunitarios.csv"'
+    return response
 
-    writer = csv.writer(response)
-    writer.writerow([
-        'Número de Caso', 'Fecha de Registro', 'Solicitante', 'Cédula Solicitante',
-        'Involucrado', 'Cédula Involucrado', 'Lugar', 'Tipo de Conflicto',
-        'Bloque(s)', 'Otro bloque', 'Valor Estimado', 'Estado', 'Juez Asignado', 
-        'Prórroga', 'Observaciones'
-    ])
-
-    for case in cases:
-        writer.writerow([
-            case.case_number,
-            case.date_registered.strftime('%d/%m/%Y %H:%M'),
-            case.applicant_name,
-            case.applicant_id,
-            case.involved_name,
-            case.involved_id,
-            case.location,
-            case.get_conflict_type_display(),
-            case.location_blocks,
-            case.other_location_block or '',
-            case.estimated_value or '',
-            case.get_status_display(),
-            case.judge.username,
-            'Sí' if case.extension_granted else 'No',
-            case.notes or ''
-        ])
 
-    return response
+# ----------------------------------------------------------------------------------
+# ✅ VISTAS: Reportes en segundo plano
+# - request_report registra el pedido con los filtros del panel (querystring)
+# - Un hilo del proceso web (o el worker run_report_jobs) genera el archivo; el
+#   panel consulta report_status hasta que está listo y luego ofrece download_report
+# ----------------------------------------------------------------------------------
+def report_job_data(job):
+    """Estado del reporte en el formato que consulta el panel"""
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'row_count': job.row_count,
+        'error': job.error,
+        'download_url': reverse('core:download_report', args=[job.pk]) if job.status == 'done' else None,
+    }
+
+
+@login_required
+def request_report_view(request):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        messages.error(request, "Acceso denegado.")
+        return redirect('core:home')
+
+    panel_url = reverse('core:admin_panel')
+    if request.GET:
+        panel_url = f"{panel_url}?{request.GET.urlencode()}"
+    if request.method != 'POST':
+        return redirect(panel_url)
+
+    job, created = request_report(request.GET, requested_by=request.user)
+    if created and settings.REPORTS_IN_PROCESS:
+        transaction.on_commit(process_queue_in_background)
+    if created:
+        messages.success(request, f"Reporte #{job.pk} en cola. Podrás descargarlo cuando esté listo.")
+    elif job.status == 'done':
+        messages.success(request, f"Los datos no cambiaron: el reporte #{job.pk} ya está listo.")
+    else:
+        messages.info(request, f"El reporte #{job.pk} con estos filtros ya se está generando.")
+    return redirect(panel_url)
+
+
+@login_required
+def report_status(request, job_id):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        return JsonResponse({'error': 'Acceso denegado.'}, status=403)
+    job = get_object_or_404(ReportJob, pk=job_id)
+    return JsonResponse(report_job_data(job))
+
+
+@login_required
+def download_report(request, job_id):
+    profile = getattr(request.user, 'profile', None)
+    if not profile or profile.role != 'admin':
+        return redirect('core:home')
+    job = get_object_or_404(ReportJob, pk=job_id, status='done')
+    storage = report_storage()
+    if not storage.exists(job.file_name):
+        raise Http404("El archivo del reporte ya no existe.")
+    return FileResponse(
+        storage.open(job.file_name, 'rb'), as_attachment=True,
+        filename=DOWNLOAD_NAME, content_type='text/csv',
+    )
 
 # ----------------------------------------------------------------------------------
 # ✅ VISTA: Personalización de la Plataforma
@@ -611,7 +692,8 @@ def platform_settings(request):
         messages.error(request, "Acceso denegado.")
         return redirect('core:home')
 
-    settings = PlatformSettings.load()
+    # ✅ Copia propia (no la de memoria): el formulario la modifica al validar
+    settings = PlatformSettings.load(use_cache=False)
 
     if request.method == 'POST':
         form = PlatformSettingsForm(request.POST, request.FILES, instance=settings)